@@ -38,6 +38,8 @@
 Connected graph class and utilities
 """
 import typing
+from collections import defaultdict
+
 import tensorflow as tf
 from keras.layers.core.tf_op_layer import TFOpLambda
 
@@ -112,6 +114,9 @@ map_tf_op_lambda_symbol_to_onnx = {
     "where": ["Where"],
 }
 
+_OP_TYPES_WITH_WEIGHT_AND_BIAS = frozenset({"Conv", "ConvTranspose", "Gemm"})
+_BATCH_NORM_PARAM_NAMES = ("weight", "bias", "running_mean", "running_var")
+
 class ConnectedGraph(AimetCommonConnectedGraph):
     """
     Connected Graph class
@@ -309,26 +314,26 @@ class ConnectedGraph(AimetCommonConnectedGraph):
             if not layer.built:
                 raise RuntimeError("Layer should be built before executing this method")
 
-            if op.type in ["Conv", "ConvTranspose", "Gemm"]:
-                weight_tensors = layer.get_weights()
+            # NOTE: Only shapes are needed here. Read them off layer.weights rather than layer.get_weights(), which
+            #       copies every variable into a numpy array.
+            op_type = op.type
+            if op_type in _OP_TYPES_WITH_WEIGHT_AND_BIAS:
+                weight_tensors = layer.weights
 
                 self._create_and_add_param_product_if_not_exists(
-                    op, f"{layer_name}.weight", list(weight_tensors[0].shape)
+                    op, f"{layer_name}.weight", weight_tensors[0].shape.as_list()
                 )
                 if layer.use_bias:
                     self._create_and_add_param_product_if_not_exists(
-                        op, f"{layer_name}.bias", list(weight_tensors[1].shape)
+                        op, f"{layer_name}.bias", weight_tensors[1].shape.as_list()
                     )
 
-            if op.type == "BatchNormalization":
-                tensor_descriptions = ["weight", "bias", "running_mean", "running_var"]
-                weight_tensors = layer.get_weights()
-
-                for weight_tensor, tensor_description in zip(weight_tensors, tensor_descriptions):
+            elif op_type == "BatchNormalization":
+                for weight_tensor, tensor_description in zip(layer.weights, _BATCH_NORM_PARAM_NAMES):
                     self._create_and_add_param_product_if_not_exists(
                         op,
                         f"{layer_name}.{tensor_description}",
-                        list(weight_tensor.shape),
+                        weight_tensor.shape.as_list(),
                     )
 
     def _create_and_add_param_product_if_not_exists(
@@ -340,7 +345,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param product_name: Name of the product to create.
         :param shape: Shape of the product to create.
         """
-        if product_name not in self._products.keys():
+        if product_name not in self._products:
             product = Product(product_name, shape)
             product.is_parm = True
             product.add_consumer(op)
@@ -352,18 +357,27 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         Find split ops whose output is used as input in many ops.
         After finding split ops, create and link product as intended
         """
+        producer_to_product_name_map = defaultdict(list)
+        for product in self._products.values():
+            if product.producer:
+                producer_to_product_name_map[product.producer.dotted_name].append(product.name)
+
         for op in self.ordered_ops:
-            self._determine_split_behavior_for_op_and_insert_split_op_in_connected_graph(op)
+            self._determine_split_behavior_for_op_and_insert_split_op_in_connected_graph(op,
+                                                                                         producer_to_product_name_map)
 
-    def _determine_split_behavior_for_op_and_insert_split_op_in_connected_graph(self, op: Op):
+    def _determine_split_behavior_for_op_and_insert_split_op_in_connected_graph(
+            self, op: Op, producer_to_product_name_map: typing.Dict[str, typing.List[str]]
+    ):
         """
         Determine if an Op's output is used as an input to more than one Op. If it is, create a Split Op and
         insert it in the connected graph, below this Op.
         Note that the split is done in the forward() function of a model and is NOT a PyTorch OP.
 
         :param op: Op to check if output is used as an input to more than one op.
+        :param producer_to_product_name_map: Dictionary mapping op names to product names which the op produces.
         """
-        output_product_names = self.get_product_names_from_dotted_name(op.dotted_name)
+        output_product_names = producer_to_product_name_map.get(op.dotted_name, ())
 
         if len(output_product_names) > 1:
             logger.debug("%s is a split Op", op.dotted_name)
@@ -371,7 +385,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
             split_op = self._create_split_op(op)
 
             # Insert the Split Op in the connected graph
-            self._insert_split_op_in_connected_graph(op, split_op)
+            self._insert_split_op_in_connected_graph(op, split_op, producer_to_product_name_map)
 
     def _create_split_op(self, op: Op) -> Op:
         """
@@ -394,11 +408,14 @@ class ConnectedGraph(AimetCommonConnectedGraph):
 
         return split_op
 
-    def _insert_split_op_in_connected_graph(self, preceding_op: Op, split_op: Op):
+    def _insert_split_op_in_connected_graph(
+            self, preceding_op: Op, split_op: Op, producer_to_product_name_map: typing.Dict[str, typing.List[str]]
+    ):
         """
         Insert a Split Op below the preceding Op in the connected graph.
         :param preceding_op: Op prior to split op
         :param split_op: Split op to insert
+        :param producer_to_product_name_map: Dictionary mapping op names to product names which the op produces.
         """
 
         # Important Notes
@@ -431,15 +448,16 @@ class ConnectedGraph(AimetCommonConnectedGraph):
 
         # 1. Create a new Product for Split Op's output.
         split_op_product = self._create_split_op_output_product(preceding_op, split_op)
+        producer_to_product_name_map[split_op.dotted_name].append(split_op_product.name)
         split_op.output = split_op_product
 
         # 2.This product has multiple consumers. Add the consumers to the Product.
         # Get the consumers from the op's multiple products.
-        self._add_consumers_to_split_op_product(preceding_op, split_op_product)
+        self._add_consumers_to_split_op_product(preceding_op, split_op_product, producer_to_product_name_map)
 
         # 3. Create a new product to connect the preceding Op to the Split Op.
         # Set the the preceding Op's output Product's consumer to Split Op.
-        self._create_product_linking_preceding_op_to_split_op(preceding_op, split_op)
+        self._create_product_linking_preceding_op_to_split_op(preceding_op, split_op, producer_to_product_name_map)
 
         # 4. Set the Split Op's input to point to current Op's output.
         split_op.inputs.append(preceding_op.output)
@@ -471,14 +489,17 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         self._products[name] = product
         return product
 
-    def _add_consumers_to_split_op_product(self, preceding_op: Op, split_op_product: Product):
+    def _add_consumers_to_split_op_product(
+            self, preceding_op: Op, split_op_product: Product,
+            producer_to_product_name_map: typing.Dict[str, typing.List[str]]
+    ):
         """
         A Split Op's output product has multiple consumers. Add them to the product.
         :param preceding_op: Op prior to split op
         :param split_op_product: Output product of split op
+        :param producer_to_product_name_map: Dictionary mapping op names to product names which the op produces.
         """
-        dotted_name = preceding_op.dotted_name
-        output_product_names = self.get_product_names_from_dotted_name(dotted_name)
+        output_product_names = producer_to_product_name_map[preceding_op.dotted_name]
 
         # Important Notes
         # ResNet model uses the same Relu twice in the forward function of ResNet's BasicBlock.
@@ -490,14 +511,12 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         # Note2 (Geunho)
         # There was no such above phenomenon when testing tf.keras.applications.resnet.ResNet50
         #   but I left it as defense logic, can remove this logic if it's clear it doesn't happen in tf.keras
-        out_product_names = [
-            name for name in output_product_names if preceding_op.name in name
+        out_products = [
+            self._products[name] for name in output_product_names
+            if self._products[name].producer is preceding_op
         ]
 
-        num_products = len(out_product_names)
-        consumer_index = 0
-        for a_product_index in range(num_products):
-            a_product = self.get_product(out_product_names[a_product_index])
+        for a_product_index, a_product in enumerate(out_products):
             a_consumer = a_product.consumers[0]
             split_op_product.consumers.append(a_consumer)
             logger.debug("Insert Split Op: Step 2a. Consumer Op: %s, a_product_index: %s",
@@ -510,14 +529,16 @@ class ConnectedGraph(AimetCommonConnectedGraph):
             a_consumer.inputs[input_product_index] = split_op_product
             logger.debug("Insert Split Op: Step 2c. For product: %s, split_op input_product_index: %s",
                          split_op_product.name, input_product_index)
-            consumer_index += 1
 
-    def _create_product_linking_preceding_op_to_split_op(self, preceding_op: Op, split_op: Op):
+    def _create_product_linking_preceding_op_to_split_op(
+            self, preceding_op: Op, split_op: Op, producer_to_product_name_map: typing.Dict[str, typing.List[str]]
+    ):
         """
         Create a new product to connect the preceding Op to the Split Op
 
         :param preceding_op: Op prior to split op
         :param split_op: Split op to create output product for
+        :param producer_to_product_name_map: Dictionary mapping op names to product names which the op produces.
         """
         # The preceding Op's output products (products, since it was behaving like a Split) are going to be deleted,
         # since a Split is being inserted in the connected graph.
@@ -526,20 +547,23 @@ class ConnectedGraph(AimetCommonConnectedGraph):
 
         # Since the preceding Op was behaving like a Split Op, it  would have 2 products with the preceding Op as the
         # producer. Delete these products from the product dictionary.
-        preceding_op_product_names = self.get_product_names_from_dotted_name(
-            preceding_op.dotted_name
-        )
+        preceding_op_product_names = producer_to_product_name_map[preceding_op.dotted_name]
+        remaining_product_names = []
         for name in preceding_op_product_names:
             # Important Notes
             # The following check is needed since ResNet uses the same Relu twice in BasicBlock's forward()
             # Please read the details comments in _add_consumers_to_split_op_product()
-            if preceding_op.name in name:
+            if self._products[name].producer is preceding_op:
                 deleted_product = self._products.pop(name)
                 logger.debug("Insert Split Op: Step 3. Deleted product: %s", deleted_product)
+            else:
+                remaining_product_names.append(name)
 
         new_product = self._add_product(
             f"{preceding_op.name}__to__{split_op.name}", preceding_op.output.shape
         )
+        remaining_product_names.append(new_product.name)
+        producer_to_product_name_map[preceding_op.dotted_name] = remaining_product_names
         new_product.producer = preceding_op
         preceding_op.output = new_product
         preceding_op.output.consumers.append(split_op)
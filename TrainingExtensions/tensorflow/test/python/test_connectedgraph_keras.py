@@ -118,6 +118,65 @@ class TestConnectedGraph:
         assert len(output_ops) == 1
         assert output_ops[0].get_module() == model.layers[-1]
 
+    def test_multi_output_with_splits(self):
+        """Test building ConnectedGraph on a model with multiple outputs and multiple splits"""
+        model = test_models_keras.multi_output_with_splits()
+
+        connected_graph = ConnectedGraph(model)
+        # 7 usual ops, 2 split ops
+        assert len(connected_graph.get_all_ops().keys()) == 7 + 2
+        assert connected_graph._split_count == 2
+
+        product_dict = connected_graph.get_all_products()
+        layer_name_to_op = {op.get_module().name: op for op in connected_graph.get_all_ops().values()
+                            if op.get_module() is not None}
+        for preceding_layer_name, consumer_layer_names in [("conv1", {"relu1", "conv2", "maxpool"}),
+                                                           ("maxpool", {"relu2", "add2"})]:
+            preceding_op = layer_name_to_op[preceding_layer_name]
+
+            # The preceding op should only be connected to the split op
+            assert [product for product in product_dict.values()
+                    if product.producer is preceding_op] == [preceding_op.output]
+            assert len(preceding_op.output.consumers) == 1
+            split_op = preceding_op.output.consumers[0]
+            assert split_op.type == "Split"
+            assert split_op.inputs == [preceding_op.output]
+
+            # The split op should feed all the layers that used the output of the preceding op
+            split_product = split_op.output
+            assert split_product.producer is split_op
+            assert product_dict[split_product.name] is split_product
+            assert {op.get_module().name for op in split_product.consumers} == consumer_layer_names
+            for consumer in split_product.consumers:
+                assert split_product in consumer.inputs
+
+        # The split op's output should be inserted in the same input position as the original product
+        add2_op = layer_name_to_op["add2"]
+        assert add2_op.inputs[0] is layer_name_to_op["maxpool"].output.consumers[0].output
+        assert add2_op.inputs[1] is layer_name_to_op["relu2"].output
+
+        output_ops = get_all_output_ops(connected_graph)
+        assert {op.get_module().name for op in output_ops} == {"add1", "add2"}
+
+    @pytest.mark.parametrize("model_fn", [test_models_keras.concat_functional,
+                                          test_models_keras.single_residual,
+                                          test_models_keras.multi_output_with_splits])
+    def test_products_per_producer(self, model_fn):
+        """Test that each op produces at most one product, which is its output, after inserting split ops"""
+        model = model_fn()
+        connected_graph = ConnectedGraph(model)
+
+        products_per_producer = {}
+        for product in connected_graph.get_all_products().values():
+            if product.producer is not None:
+                products_per_producer.setdefault(id(product.producer), []).append(product)
+
+        for op in connected_graph.get_all_ops().values():
+            products = products_per_producer.get(id(op), [])
+            assert len(products) <= 1
+            if products:
+                assert products[0] is op.output
+
     def test_nested_sequential(self):
         """Test building ConnectedGraph on a model constructed with nested Sequential"""
         model = test_models_keras.nested_sequential_model()
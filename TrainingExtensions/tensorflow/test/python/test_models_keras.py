@@ -136,6 +136,25 @@ def single_residual(num_classes=10):
     return tf.keras.Model(inputs=inputs, outputs=outputs)
 
 
+def multi_output_with_splits():
+    """
+    Functional model with multiple outputs whose intermediate outputs are used by multiple layers
+    """
+    inputs = tf.keras.Input(shape=(16, 16, 3))
+    x = tf.keras.layers.Conv2D(8, kernel_size=3, padding="same", name="conv1")(inputs)
+
+    # Output of conv1 is used by three layers
+    a = tf.keras.layers.ReLU(name="relu1")(x)
+    b = tf.keras.layers.Conv2D(8, kernel_size=1, name="conv2")(x)
+    c = tf.keras.layers.MaxPooling2D(pool_size=1, name="maxpool")(x)
+    output1 = tf.keras.layers.Add(name="add1")([a, b])
+
+    # Output of maxpool is used by two layers
+    d = tf.keras.layers.ReLU(name="relu2")(c)
+    output2 = tf.keras.layers.Add(name="add2")([c, d])
+
+    return tf.keras.Model(inputs=inputs, outputs=[output1, output2])
+
 def nested_sequential_model(num_classes=3):
     """
     Nested sequential model implemented by Sequential style
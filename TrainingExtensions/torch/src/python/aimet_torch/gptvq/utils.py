@@ -36,11 +36,13 @@
 # =============================================================================
 # pylint: disable=redefined-outer-name
 """Utility methods for working with GPTVQ"""
+import functools
 import math
 from typing import Optional, List, Tuple, Dict
 
 import torch
 from torch import nn
+from packaging import version
 
 import aimet_torch.v2.quantization as Q
 from aimet_torch.gptvq.activation_sampler import ActivationSampler
@@ -51,13 +53,16 @@ from aimet_torch.v2.quantsim import QuantizationSimModel
 
 HESSIAN_WEIGHTED_LOOKUP = False
 DO_CODEBOOK_FINE_TUNING = False
+# If True, K-means iteration body is compiled with torch.compile upon its first invocation
+USE_TORCH_COMPILE = False
 
 
 def generate_codebook(weight_block: torch.Tensor,
                       num_of_centroids: int,
                       inverse_hessian_diagonal: Optional[torch.Tensor] = None,
                       assignment_chunk_size: Optional[int] = None,
-                      kmeans_iteration: int = 100):
+                      kmeans_iteration: int = 100,
+                      centroid_chunk_size: Optional[int] = None):
     """
     Generate and optimize codebook using K-means and return it
 
@@ -66,18 +71,51 @@ def generate_codebook(weight_block: torch.Tensor,
     :param inverse_hessian_diagonal: Diagonal of inverse Hessian tensor
     :param assignment_chunk_size: Chunk size for better memory management
     :param kmeans_iteration: Number of K-means iterations
+    :param centroid_chunk_size: Chunk size along num_centroids for better memory management
     :return: Optimized codebook
     """
     codebook = hacky_mahalanobis_init(weight_block, num_of_centroids)
+    # Manipulated Hessian and maximization terms don't change across K-means iterations
+    manipulated_hessian = manipulate_inverse_hessian_diagonal(weight_block, inverse_hessian_diagonal)
+    maximization_source = _get_maximization_source(weight_block, inverse_hessian_diagonal)
+    kmeans_step = _get_compiled_kmeans_step() if USE_TORCH_COMPILE else _kmeans_step
     for _ in range(kmeans_iteration):
-        # Expectation step
-        assignments = get_assignments(weight_block, codebook, inverse_hessian_diagonal, assignment_chunk_size)
-
-        # Maximization step
-        codebook = do_kmeans_maximization(weight_block, codebook, assignments, inverse_hessian_diagonal)
+        codebook = kmeans_step(weight_block, codebook, manipulated_hessian, maximization_source,
+                               assignment_chunk_size, centroid_chunk_size)
     return codebook
 
 
+# pylint: disable=too-many-arguments
+def _kmeans_step(weight_block: torch.Tensor,
+                 codebook: torch.Tensor,
+                 manipulated_hessian: Optional[torch.Tensor],
+                 maximization_source: torch.Tensor,
+                 assignment_chunk_size: Optional[int],
+                 centroid_chunk_size: Optional[int]) -> torch.Tensor:
+    """
+    Run a single K-means iteration and return updated codebook
+    """
+    # Expectation step
+    assignments = _get_assignments(weight_block, codebook, manipulated_hessian,
+                                   assignment_chunk_size, centroid_chunk_size)
+
+    # Maximization step
+    return _do_kmeans_maximization(maximization_source, codebook, assignments)
+
+
+@functools.lru_cache(None)
+def _get_compiled_kmeans_step():
+    """
+    Returns torch.compile'd K-means iteration body, compiling it only once
+    """
+    if version.parse(torch.__version__) < version.parse("2.0.0"):
+        raise RuntimeError("USE_TORCH_COMPILE requires torch>=2.0.0. "
+                           f"Got torch=={torch.__version__}")
+    # Weight block shapes are fixed throughout the K-means loop. Chunk sizes are python ints,
+    # so they are specialized as constants
+    return torch.compile(_kmeans_step, dynamic=False)
+
+
 def hacky_mahalanobis_init(tensor: torch.Tensor, num_of_centroids: int) -> torch.Tensor:
     """
     Initialize centroids using hacky Mahalanobis
@@ -100,16 +138,16 @@ def hacky_mahalanobis_init(tensor: torch.Tensor, num_of_centroids: int) -> torch
 
 
 def manipulate_inverse_hessian_diagonal(tensor: torch.Tensor,
-                                        inverse_hessian_diagonal: Optional[torch.Tensor]) -> torch.Tensor:
+                                        inverse_hessian_diagonal: Optional[torch.Tensor]) -> Optional[torch.Tensor]:
     """
     Manipulate diagonal of inverse Hessian tensor if needed
 
     :param tensor: Tensor corresponding to diagonal of inverse Hessian tensor
     :param inverse_hessian_diagonal: Diagonal of inverse Hessian tensor
-    :return: Manipulated Hessian tensor
+    :return: Manipulated Hessian tensor, or None if distance is unweighted
     """
     if inverse_hessian_diagonal is None:
-        return torch.ones(tensor.shape[-1], device=tensor.device)
+        return None
 
     if inverse_hessian_diagonal.ndim > 2:  # should then be 1 x N x vector_dim
         assert (
@@ -151,7 +189,7 @@ def generate_hessian_chunks(hessian: torch.Tensor,
     if chunk_size is None:
         return [hessian]
 
-    if hessian.ndim > 1:
+    if hessian.ndim > 2:  # 1 x N x 1 x vector_dim
         return torch.split(hessian, chunk_size, dim=1)
 
     return [hessian] * num_of_tensor_chunks
@@ -177,29 +215,122 @@ def prepare_tensor_and_hessian_chunks(tensor: torch.Tensor,
 def get_assignments(tensor: torch.Tensor,
                     centroids: torch.Tensor,
                     inverse_hessian_diagonal: Optional[torch.Tensor] = None,
-                    chunk_size: Optional[int] = None) -> torch.Tensor:
+                    chunk_size: Optional[int] = None,
+                    centroid_chunk_size: Optional[int] = None) -> torch.Tensor:
     """
     Calculate nearest centroid index tensor
 
     :param tensor: num_blocks_per_column x N x vector_dim
     :param centroids: num_blocks_per_column x num_centroids x vector_dim
     :param inverse_hessian_diagonal: Diagonal of inverse Hessian tensor
-    :param chunk_size: Chunk size for better memory management
+    :param chunk_size: Chunk size along N for better memory management
+    :param centroid_chunk_size: Chunk size along num_centroids for better memory management
     :return: nearest centroid index tensor
     """
     manipulated_hessian = manipulate_inverse_hessian_diagonal(tensor, inverse_hessian_diagonal)
-    tensor_chunks, hessian_chunks = prepare_tensor_and_hessian_chunks(tensor, manipulated_hessian, chunk_size)
+    return _get_assignments(tensor, centroids, manipulated_hessian, chunk_size, centroid_chunk_size)
+
+
+def _get_assignments(tensor: torch.Tensor,
+                     centroids: torch.Tensor,
+                     manipulated_hessian: Optional[torch.Tensor],
+                     chunk_size: Optional[int],
+                     centroid_chunk_size: Optional[int] = None) -> torch.Tensor:
+    """
+    Calculate nearest centroid index tensor given already manipulated diagonal of inverse Hessian
+
+    :param tensor: num_blocks_per_column x N x vector_dim
+    :param centroids: num_blocks_per_column x num_centroids x vector_dim
+    :param manipulated_hessian: Output of manipulate_inverse_hessian_diagonal, or None for unweighted distance
+    :param chunk_size: Chunk size along N for better memory management
+    :param centroid_chunk_size: Chunk size along num_centroids for better memory management
+    :return: nearest centroid index tensor
+    """
+    # NOTE: sum(h * (x - c)^2) = sum(h * x^2) - 2 * sum(h * x * c) + sum(h * c^2)
+    #       The first term is constant for each vector and can be dropped for argmin.
+    #       The other two terms are computed with matmul, which avoids materializing
+    #       a num_blocks_per_column x N x num_centroids x vector_dim intermediate tensor.
+    vector_dim = tensor.shape[-1]
+    transposed_centroids = centroids.transpose(1, 2)  # num_blocks_per_column x vector_dim x num_centroids
+    squared_centroids = transposed_centroids.pow(2)
+
+    num_elements = tensor.shape[1]
+    if chunk_size is None:
+        chunk_size = num_elements
+
+    hessian, shared_centroid_norm = None, None
+    if manipulated_hessian is None:
+        # Unweighted distance. Skip multiplying by all-ones Hessian
+        shared_centroid_norm = squared_centroids.sum(1, keepdim=True)  # num_blocks_per_column x 1 x num_centroids
+    else:
+        hessian = manipulated_hessian.reshape(-1, vector_dim)  # (1 or N) x vector_dim
+        if manipulated_hessian.ndim <= 2:
+            # Hessian is shared by all vectors. Compute centroid norm only once for all chunks
+            # num_blocks_per_column x 1 x num_centroids
+            shared_centroid_norm = torch.matmul(hessian, squared_centroids)
 
-    centroids = centroids.unsqueeze(1) # num_blocks_per_column x 1 x num_centroids x vector_dim
     assignments = []
-    for tensor_chunk, hessian_chunk in zip(tensor_chunks, hessian_chunks):
-        tensor_chunk = tensor_chunk.unsqueeze(2) # num_blocks_per_column x N x 1 x vector_dim
-        distance = ((tensor_chunk - centroids).pow(2) * hessian_chunk).sum(-1)
-        assignments.append(distance.argmin(-1))
+    for start in range(0, num_elements, chunk_size):
+        end = start + chunk_size
+        tensor_chunk = tensor[:, start:end]
+        hessian_chunk = hessian
+        if hessian is not None:
+            if shared_centroid_norm is None:
+                hessian_chunk = hessian[start:end]
+            tensor_chunk = tensor_chunk * hessian_chunk
+        assignments.append(
+            _get_nearest_centroid_index(tensor_chunk, transposed_centroids, squared_centroids,
+                                        shared_centroid_norm, hessian_chunk, centroid_chunk_size)
+        )
 
     return torch.concat(assignments, dim=1)  # num_blocks_per_column x N
 
 
+# pylint: disable=too-many-arguments
+def _get_nearest_centroid_index(weighted_tensor: torch.Tensor,
+                                transposed_centroids: torch.Tensor,
+                                squared_centroids: torch.Tensor,
+                                shared_centroid_norm: Optional[torch.Tensor],
+                                hessian: Optional[torch.Tensor],
+                                centroid_chunk_size: Optional[int]) -> torch.Tensor:
+    """
+    Find nearest centroid index, keeping running argmin over centroid chunks
+
+    :param weighted_tensor: Hessian-weighted tensor (num_blocks_per_column x N x vector_dim)
+    :param transposed_centroids: num_blocks_per_column x vector_dim x num_centroids
+    :param squared_centroids: Element-wise squared transposed centroids
+    :param shared_centroid_norm: Weighted centroid norm shared by all vectors if available
+    :param hessian: Per-vector manipulated Hessian (N x vector_dim) used if shared_centroid_norm is None
+    :param centroid_chunk_size: Chunk size along num_centroids
+    :return: nearest centroid index tensor (num_blocks_per_column x N)
+    """
+    num_centroids = transposed_centroids.shape[-1]
+    if centroid_chunk_size is None:
+        centroid_chunk_size = num_centroids
+
+    best_distance, best_index = None, None
+    for start in range(0, num_centroids, centroid_chunk_size):
+        end = start + centroid_chunk_size
+        if shared_centroid_norm is not None:
+            centroid_norm = shared_centroid_norm[..., start:end]
+        else:
+            centroid_norm = torch.matmul(hessian, squared_centroids[..., start:end])
+
+        # num_blocks_per_column x N x centroid_chunk_size
+        distance = centroid_norm - 2 * torch.bmm(weighted_tensor, transposed_centroids[..., start:end])
+        min_distance, min_index = distance.min(-1)
+
+        if best_distance is None:
+            best_distance, best_index = min_distance, min_index
+        else:
+            # NOTE: Strict comparison keeps the lowest index on ties, same as a single argmin
+            is_closer = min_distance < best_distance
+            best_distance = torch.where(is_closer, min_distance, best_distance)
+            best_index = torch.where(is_closer, min_index + start, best_index)
+
+    return best_index
+
+
 def do_kmeans_maximization(tensor: torch.Tensor,
                            centroids: torch.Tensor,
                            assignments: torch.Tensor,
@@ -213,32 +344,48 @@ def do_kmeans_maximization(tensor: torch.Tensor,
     :param inverse_hessian_diagonal: Diagonal of inverse Hessian (1 x N x vector_dim)
     :return: Updated codebook after maximization step
     """
-    centroid_range = torch.arange(centroids.shape[1], device=centroids.device)
-    expanded_assignments = (
-        assignments.unsqueeze(-1) == centroid_range.view(1, 1, -1)
-    ).to(tensor.dtype)
+    maximization_source = _get_maximization_source(tensor, inverse_hessian_diagonal)
+    return _do_kmeans_maximization(maximization_source, centroids, assignments)
 
+
+def _get_maximization_source(tensor: torch.Tensor,
+                             inverse_hessian_diagonal: Optional[torch.Tensor]) -> torch.Tensor:
+    """
+    Concatenate numerator and denominator terms of K-means maximization step along the last dimension
+
+    :param tensor: torch.Tensor (num_blocks_per_column x N x vector_dim)
+    :param inverse_hessian_diagonal: Diagonal of inverse Hessian (1 x N x vector_dim)
+    :return: [tensor, 1] (num_blocks_per_column x N x (vector_dim + 1)) if unweighted,
+             [h * tensor, h] (num_blocks_per_column x N x (2 * vector_dim)) otherwise
+    """
     if inverse_hessian_diagonal is None:
-        norm = 1.0 / torch.clip(expanded_assignments.sum(1), min=1)
-        new_centroids = torch.einsum(
-            "gnd,gnk,gk->gkd", tensor, expanded_assignments, norm
-        )
-    else:
-        norm = 1.0 / torch.clip(
-            torch.einsum(
-                "gnk,nd->gkd", expanded_assignments, inverse_hessian_diagonal[0]
-            ),
-            min=1e-10,
-        )
-        new_centroids = torch.einsum(
-            "gnd,nd,gnk,gkd->gkd",
-            tensor,
-            inverse_hessian_diagonal[0],
-            expanded_assignments,
-            norm,
-        )
+        return torch.cat([tensor, torch.ones_like(tensor[..., :1])], dim=-1)
+
+    hessian = inverse_hessian_diagonal[0].expand_as(tensor)  # num_blocks_per_column x N x vector_dim
+    return torch.cat([tensor * hessian, hessian], dim=-1)
+
 
-    return new_centroids
+def _do_kmeans_maximization(maximization_source: torch.Tensor,
+                            centroids: torch.Tensor,
+                            assignments: torch.Tensor) -> torch.Tensor:
+    """
+    Do K-means maximization step given output of _get_maximization_source
+
+    :param maximization_source: Output of _get_maximization_source
+    :param centroids: Codebook including centroids (num_blocks_per_column x num_centroids x vector_dim)
+    :param assignments: Assignment result from expectation step (num_blocks_per_column x N)
+    :return: Updated codebook after maximization step
+    """
+    # NOTE: Accumulate numerator and denominator of each centroid in a single scatter_add_
+    #       instead of contracting with a num_blocks_per_column x N x num_centroids one-hot tensor.
+    vector_dim = centroids.shape[-1]
+    index = assignments.unsqueeze(-1).expand_as(maximization_source)
+    accumulated = maximization_source.new_zeros(*centroids.shape[:2], maximization_source.shape[-1])
+    accumulated.scatter_add_(1, index, maximization_source)
+
+    centroid_sum, denominator = accumulated[..., :vector_dim], accumulated[..., vector_dim:]
+    # Empty clusters have zero numerator and denominator, and collapse to zero as before
+    return centroid_sum / torch.clip(denominator, min=1e-10)
 
 
 def quad_loss_2(
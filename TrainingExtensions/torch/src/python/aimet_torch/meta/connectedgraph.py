@@ -42,7 +42,7 @@ operations represent a module or a function that generates a tensor, while produ
 the tensors that are either input to the model (input, constant or parameter) or the
 result of an operation. Furthermore the graph representation is bi-directional."""
 
-import copy
+import functools
 from collections import defaultdict
 from typing import Tuple, Union, List, Dict, Type, Optional
 import torch
@@ -111,11 +111,13 @@ class GetAttrNodeInfo:
     """
     Holds information for GetAttr node types.
     """
-    def __init__(self, node_alias: str, node_name: str, node_input: Union[None, str]):
+    def __init__(self, node_alias: int, node_name: str, node_input: Union[None, int]):
         """
         Ex. GetAttr node: %1 : ... prim::GetAttr[name="model"](%self.1)
         node_alias: %1, node_name: model, node_input: %self.1
-        :param node_alias: String representing an alias for this node (used as input in other nodes)
+        Node aliases are identified by unique() of the corresponding graph values rather than their debug names,
+        since integer keys are cheaper to look up than strings.
+        :param node_alias: Unique id of the value aliasing this node (used as input in other nodes)
         :param node_name: Name of this node as it is referred to in trace attributes
         :param node_input: Inputs to this node. Will be node aliases of other nodes. If this node is a direct descendant
             of the current trace graph being parsed, node_input will point to the current module. Otherwise, it points
@@ -153,6 +155,8 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         self._split_count = 0  # Use it in the name of split Ops getting added to the connected graph.
         # Counts number of constant inputs there are in the graph
         self._constant_count = 0
+        # Maps pytorch modules to whether their trace needs to be parsed recursively
+        self._is_recursive_parsing_needed_cache = {}
 
         self._generate_module_lookup_table(model)
         with in_eval_mode(model), torch.no_grad():
@@ -295,13 +299,15 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         self._create_param_products()
 
         # For each split in the model, insert a corresponding split Op in the connected graph.
-        # pylint: disable=unnecessary-comprehension
-        ops_list = [op for op in self._ops.values()]
         producer_to_product_name_map = defaultdict(list)
         for product in self._products.values():
             if product.producer:
                 producer_to_product_name_map[product.producer.dotted_name].append(product.name)
 
+        # Only ops producing more than one product can be followed by a split. Inserting split ops never adds products
+        # to an existing producer, so filtering the candidates up front doesn't miss any split.
+        ops_list = [op for op in self._ops.values()
+                    if len(producer_to_product_name_map.get(op.dotted_name, ())) > 1]
         for op in ops_list:
             self._determine_split_behavior_for_op_and_insert_split_op_in_connected_graph(op,
                                                                                          producer_to_product_name_map)
@@ -314,8 +320,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param model: Pytorch model to create connected graph from
         """
         module_to_jit_trace = self._generate_trace_lookup_table(model, trace)
-        # pylint: disable=unnecessary-comprehension
-        top_level_inputs = [inp for inp in trace.graph.inputs()][1:]
+        top_level_inputs = list(trace.graph.inputs())[1:]
         output_map = {}
         for idx, inp in enumerate(top_level_inputs):
             shape = get_torch_tensortype_shape(inp)
@@ -346,8 +351,8 @@ class ConnectedGraph(AimetCommonConnectedGraph):
             node currently being processed
         :return: the outputs of the traced module
         """
-        # pylint: disable=unnecessary-comprehension
-        curr_inputs = [inp for inp in trace.graph.inputs()]
+        graph = trace.graph
+        curr_inputs = list(graph.inputs())
 
         # curr_inputs[0] corresponds to an identifier for the current graph node.
         assert len(curr_inputs) == len(higher_level_inputs) + 1
@@ -363,14 +368,19 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         # A map of sub-graph models and node name that requires recursive parsing
         node_name_to_subgraph_model = {}
         # modules that are being referenced within the sub-graph
-        node_name_to_module = {curr_inputs[0].debugName(): model}
+        node_name_to_module = {curr_inputs[0].unique(): model}
         # Keep track of output tensors generated from this current trace level. After parsing all nodes, remove all
         # entries in output_map that are contained in this list, except for tensors that are outputted from this graph.
         curr_level_tensors = []
 
-        for node in trace.graph.nodes():
-            # pylint: disable=unnecessary-comprehension
-            outputs = [output for output in node.outputs()]
+        # Aten node corresponding to the elementwise op. Find it only once per trace level instead of once per node
+        elementwise_aten_node = None
+        if elementwise_info:
+            aten_nodes = self._find_aten_nodes_in_forward_pass(trace)
+            elementwise_aten_node = aten_nodes[0] if aten_nodes else None
+
+        for node in graph.nodes():
+            outputs = list(node.outputs())
 
             # retrieving a module reference
             if 'GetAttr' in node.kind():
@@ -398,8 +408,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
 
             # functional operations e.g. cat, size etc
             else:
-                aten_nodes = self._find_aten_nodes_in_forward_pass(trace)
-                if elementwise_info and node == aten_nodes[0]:
+                if elementwise_info and node == elementwise_aten_node:
                     # Aten op that corresponds to the elementwise op
                     op_type = self.get_op_type(type(elementwise_info[1]))
                     op = self._create_new_multi_output_op(op_type,
@@ -409,8 +418,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
                     op_type = self._get_functional_node_type(node)
                     op = self._create_new_multi_output_op(op_type, residing_module=model)
                 # For prim and aten nodes, inputs[0] is a regular input to the module, so no need to take inputs[1:]
-                # pylint: disable=unnecessary-comprehension
-                self._add_products_for_op(op, [inp for inp in node.inputs()], outputs, output_map)
+                self._add_products_for_op(op, list(node.inputs()), outputs, output_map)
                 for output in outputs:
                     curr_level_tensors.append(output)
 
@@ -426,12 +434,12 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         # Any entries in the output_map which don't show up in the returned tensors for the current graph level will not
         # be used again. Remove them from output_map. Not removing entries will cause us to run into issues if a
         # duplicated non leaf module is seen later on during trace parsing.
-        curr_level_outputs = set(trace.graph.return_node().inputs())
+        curr_level_outputs = set(graph.return_node().inputs())
         for output in curr_level_tensors:
             if output not in curr_level_outputs:
                 del output_map[output]
 
-        return list(trace.graph.return_node().inputs())
+        return list(graph.return_node().inputs())
 
     @staticmethod
     def _parse_op_type(node: torch._C.Node) -> str:
@@ -440,14 +448,12 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param node: trace graph node
         :return: Op Type string
         """
-        # extracting Op type from node.kind string e.g. aten::relu_, aten::size etc
-        op_type = node.kind().split("::")[-1].lstrip('_').rstrip('_')
-        return op_type
+        return _parse_op_type_from_kind(node.kind())
 
     # pylint: disable=too-many-arguments
     def _parse_getattr_node(self, node: torch._C.Node, inputs: List[torch._C.TensorType],
-                            outputs: List[torch._C.TensorType], node_name_to_module: Dict[str, torch.nn.Module],
-                            node_name_to_subgraph_model: Dict[str, Tuple[torch.jit.TracedModule, torch._C.Node]],
+                            outputs: List[torch._C.TensorType], node_name_to_module: Dict[int, torch.nn.Module],
+                            node_name_to_subgraph_model: Dict[int, Tuple[torch.jit.TracedModule, torch._C.Node]],
                             module_to_jit_trace: Dict[torch.nn.Module, torch.jit.TracedModule],
                             residing_module: torch.nn.Module,
                             output_map: Dict[torch._C.TensorType, Product],
@@ -470,14 +476,13 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         # For GetAttr lines, the output name will be referring to the module, and not the module's output(s)
         assert len(outputs) == 1
         getattr_node_info = ConnectedGraph._get_getattr_node_info(node)
-        if getattr_node_info.node_input == inputs[0].debugName():
+        if getattr_node_info.node_input == inputs[0].unique():
             getattr_node_info.node_input = None
 
         subgraph_model = ConnectedGraph._get_module_instance(node, node_name_to_module)
         if isinstance(subgraph_model, torch.Tensor):
             op = self._create_new_multi_output_op('Constant', residing_module=residing_module)
-            # pylint: disable=unnecessary-comprehension
-            self._add_products_for_op(op, [inp for inp in node.inputs()], outputs, output_map)
+            self._add_products_for_op(op, list(node.inputs()), outputs, output_map)
             for output in outputs:
                 curr_level_tensors.append(output)
             return
@@ -504,8 +509,8 @@ class ConnectedGraph(AimetCommonConnectedGraph):
     # pylint: disable=too-many-arguments
     def _parse_callmethod_node(self, node: torch._C.Node,
                                trace: Union[torch.jit.TopLevelTracedModule, torch.jit.TracedModule],
-                               node_name_to_module: Dict[str, torch.nn.Module],
-                               node_name_to_subgraph_model: Dict[str, Tuple[torch.jit.TracedModule, torch._C.Node]],
+                               node_name_to_module: Dict[int, torch.nn.Module],
+                               node_name_to_subgraph_model: Dict[int, Tuple[torch.jit.TracedModule, torch._C.Node]],
                                output_map: Dict[torch._C.TensorType, Product],
                                residing_module: torch.nn.Module,
                                module_to_jit_trace: Dict[torch.nn.Module, torch.jit.TracedModule]):
@@ -523,32 +528,26 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param residing_module: Torch module in which the current node is situated
         :param module_to_jit_trace: Dictionary mapping torch modules to their traces
         """
-        # pylint: disable=unnecessary-comprehension
-        inputs = [inp for inp in node.inputs()]
+        inputs = list(node.inputs())
         # 1st input is a reference on which the call method is being invoked.
-        input_name: str = inputs[0].debugName()
-        # pylint: disable=unnecessary-comprehension
-        outputs = [output for output in node.outputs()]
+        input_id: int = inputs[0].unique()
+        outputs = list(node.outputs())
 
         # We don't want to further trace some custom implementation from aimet_modules
-        if input_name in node_name_to_subgraph_model and \
-                not isinstance(node_name_to_subgraph_model[input_name][0], tuple(SKIP_LIST_FOR_SUBGRAPH_TRACE)):
+        if input_id in node_name_to_subgraph_model and \
+                not isinstance(node_name_to_subgraph_model[input_id][0], tuple(SKIP_LIST_FOR_SUBGRAPH_TRACE)):
             elementwise_info = None
-            subgraph_model, getattr_node_info = node_name_to_subgraph_model[input_name]
-            # For elementwise ops, we need to parse the callmethod interior, but want to retain information about the
-            # elementwise op's residing module and torch module
-            if self._is_multi_input_op_to_parse(subgraph_model):
-                elementwise_info = (residing_module, node_name_to_module[input_name])
+            subgraph_model, getattr_node_info = node_name_to_subgraph_model[input_id]
             trace_levels = [getattr_node_info.node_name]
             # If node_input (input to the current GetAttr node) is None, we are at the topmost level, and can call
             # trace.<current node name> to get the trace for the subgraph. Otherwise, compile a list of node names to
             # call into by following the subgraph_input entries up the chain.
             while getattr_node_info.node_input is not None:
                 _, getattr_node_info = node_name_to_subgraph_model[getattr_node_info.node_input]
-                # Later on trace levels will be processed with most recent level first, so insert each one at the front.
-                trace_levels.insert(0, getattr_node_info.node_name)
+                trace_levels.append(getattr_node_info.node_name)
             subgraph_trace = trace
-            for level in trace_levels:
+            # Trace levels were collected from the innermost level, so process them in reverse order.
+            for level in reversed(trace_levels):
                 subgraph_trace = getattr(subgraph_trace, level)
 
             # For elementwise ops, we need to parse the callmethod interior, but want to retain information about the
@@ -557,13 +556,13 @@ class ConnectedGraph(AimetCommonConnectedGraph):
                 aten_nodes = self._find_aten_nodes_in_forward_pass(subgraph_trace)
                 assert len(aten_nodes) <= 1
                 if len(aten_nodes) == 1:
-                    elementwise_info = (residing_module, node_name_to_module[input_name])
+                    elementwise_info = (residing_module, node_name_to_module[input_id])
                 else:
                     # This is an elementwise op that does not actually perform aten operations inside.
                     # We see this in case of elementwise Add when it is concatenating two lists for example.
                     # In this case, simply treat the op as a leaf level op without parsing the interior.
-                    op_type = self.get_op_type(type(node_name_to_module[input_name]))
-                    op = self._create_new_multi_output_op(op_type, residing_module, node_name_to_module[input_name])
+                    op_type = self.get_op_type(type(node_name_to_module[input_id]))
+                    op = self._create_new_multi_output_op(op_type, residing_module, node_name_to_module[input_id])
                     self._add_products_for_op(op, inputs[1:], outputs, output_map)
                     return outputs
 
@@ -573,8 +572,8 @@ class ConnectedGraph(AimetCommonConnectedGraph):
             return submodule_outputs
 
         # Op is a leaf level module
-        op_type = self.get_op_type(type(node_name_to_module[input_name]))
-        op = self._create_new_multi_output_op(op_type, residing_module, node_name_to_module[input_name])
+        op_type = self.get_op_type(type(node_name_to_module[input_id]))
+        op = self._create_new_multi_output_op(op_type, residing_module, node_name_to_module[input_id])
         self._add_products_for_op(op, inputs[1:], outputs, output_map)
         return outputs
 
@@ -607,28 +606,24 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param node: trace graph node
         :return: a dictionary of attributes associated with the node
         """
-        attributes = {}
         # node description has pseudo-code of the form  '... torch_mangle_2.Module = prim::GetAttr[name="fc"](%self.1)'
-        # for the above example attributeNames() iterator should return a string 'name'
-        node_desc = str(node)
-        for attribute_name in node.attributeNames():
-            pattern = attribute_name + '="'
-            if pattern in node_desc:
-                attributes[attribute_name] = node_desc.split(pattern)[1].split('"')[0]
-        return attributes
+        # for the above example attributeNames() iterator should return a string 'name'.
+        # Read string attributes directly instead of formatting the whole node with str(node) and parsing it.
+        return {attribute_name: node.s(attribute_name) for attribute_name in node.attributeNames()
+                if node.kindOf(attribute_name) == 's'}
 
     @staticmethod
     def _get_module_instance(node: torch._C.Node,
-                             node_name_to_module: Dict[str, torch.nn.Module]) -> torch.nn.Module:
+                             node_name_to_module: Dict[int, torch.nn.Module]) -> torch.nn.Module:
         """
         Get the torch.nn.Module referenced by the node.
         :param node: trace graph node
         :param node_name_to_module: dictionary of module index by output_name referenced in the sub-graph
         :return: torch module corresponding to the node
         """
-        input_name: str = node.input().debugName()
+        input_id: int = node.input().unique()
         attributes = ConnectedGraph._get_attribute_name(node)
-        model = node_name_to_module[input_name]
+        model = node_name_to_module[input_id]
         sub_model = getattr(model, attributes['name'])
         return sub_model
 
@@ -647,10 +642,8 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         # %2 : ... prim::GetAttr[name="_layer0"](%1)
         # Here, to call into %2 from the current trace, we must call .model._layer0. Tracking inputs to
         # the GetAttr nodes tells us this path (%2 comes from %1 which comes from %self.1, the current module)
-        # pylint: disable=unnecessary-comprehension
-        node_input = [inp for inp in node.inputs()][0].debugName()
-        # pylint: disable=unnecessary-comprehension
-        node_alias = [output for output in node.outputs()][0].debugName()
+        node_input = node.input().unique()
+        node_alias = node.output().unique()
         node_name = ConnectedGraph._get_attribute_name(node).get('name')
         return GetAttrNodeInfo(node_alias, node_name, node_input)
 
@@ -707,12 +700,12 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         """
         Remove passthrough and Constant input ops
         """
+        types_to_ignore = set(self.passthrough_graph_nodes).union(self.input_graph_nodes_to_ignore)
         ops_to_remove = []
         for op in self.get_all_ops().values():
-            if op.type in self.passthrough_graph_nodes or op.type in self.input_graph_nodes_to_ignore:
+            if op.type in types_to_ignore:
                 assert len(op.output_products) == 1
-                # pylint: disable=unnecessary-comprehension
-                consumers = [consumer for consumer in op.output_products[0].consumers]
+                consumers = list(op.output_products[0].consumers)
 
                 if not op.inputs:
                     # Op has no inputs. Simply delete the op, its output product, and the output product from the inputs
@@ -720,8 +713,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
                     for consumer in consumers:
                         # Check if consumer is not a passthrough or ignore op type. If so, create a constant input into
                         # the consumer.
-                        if consumer.type in self.passthrough_graph_nodes or consumer.type in \
-                                self.input_graph_nodes_to_ignore:
+                        if consumer.type in types_to_ignore:
                             consumer.inputs.remove(op.output_products[0])
                         else:
                             product_index = consumer.inputs.index(op.output_products[0])
@@ -761,8 +753,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
             if op.type in ['TupleConstruct', 'ListConstruct']:
                 assert len(op.output_products) == 1
                 output = op.output_products[0]
-                # pylint: disable=unnecessary-comprehension
-                consumers = [consumer for consumer in output.consumers]
+                consumers = list(output.consumers)
 
                 # For each consumer, update their inputs by replacing the connection from Tuple/ListConstruct to the
                 # inputs of Tuple/ListConstruct instead
@@ -818,6 +809,8 @@ class ConnectedGraph(AimetCommonConnectedGraph):
                         # Delete the singular input product to the op, and replace it with multiple distinct products
                         # for each output product of the op.
                     del self._products[op.inputs[0].name]
+                    # Consumers of the input product don't change in the loop below, so look them up once
+                    input_product_consumers = set(op.inputs[0].consumers)
                     for idx, output_product in enumerate(op.output_products):
                         # Create a product for each consumer of tuple unpack, to represent a distinct tensor feeding
                         # into each consumer.
@@ -827,7 +820,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
                             consumer_input_idx = consumer.inputs.index(output_product)
                             consumer.inputs[consumer_input_idx] = new_product
                             # Add consumer into this op's input product consumers if not already present
-                            if consumer not in op.inputs[0].consumers:
+                            if consumer not in input_product_consumers:
                                 new_product.add_consumer(consumer)
                         if inp_op is not None:
                             new_product.producer = inp_op
@@ -938,12 +931,13 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         For certain ops like convolution, batch norm, and linear, create products for their parameters if they don't
         exist yet.
         """
+        leaf_module_types = tuple(aimet_torch.utils.modules_to_treat_as_leaf)
         for op in self._ops.values():
             module = op.get_module()
             if module is not None:
                 name = self._module_to_name.get(module, None)
-                if isinstance(op.get_module(), tuple(aimet_torch.utils.modules_to_treat_as_leaf)):
-                    for child_name, child_module in op.get_module().named_children():
+                if isinstance(module, leaf_module_types):
+                    for child_name, child_module in module.named_children():
                         self._create_param_products_helper(op, child_module, name + "." + child_name,
                                                            self.get_op_type(type(child_module)))
                 else:
@@ -961,20 +955,20 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         if op_type in ['Conv', 'ConvTranspose', 'BatchNormalization', 'Gemm']:
             if module.weight is not None:
                 product_name = module_name + '.weight'
-                self._create_and_add_param_product_if_not_exists(conn_graph_op, product_name, list(module.weight.shape))
+                self._create_and_add_param_product_if_not_exists(conn_graph_op, product_name, module.weight.shape)
             if module.bias is not None:
                 product_name = module_name + '.bias'
-                self._create_and_add_param_product_if_not_exists(conn_graph_op, product_name, list(module.bias.shape))
+                self._create_and_add_param_product_if_not_exists(conn_graph_op, product_name, module.bias.shape)
         if op_type == 'BatchNormalization':
             # If batch_norm, fill in rest of bn params
             if module.running_mean is not None:
                 product_name = module_name + '.running_mean'
                 self._create_and_add_param_product_if_not_exists(conn_graph_op, product_name,
-                                                                 list(module.running_mean.shape))
+                                                                 module.running_mean.shape)
             if module.running_var is not None:
                 product_name = module_name + '.running_var'
                 self._create_and_add_param_product_if_not_exists(conn_graph_op, product_name,
-                                                                 list(module.running_var.shape))
+                                                                 module.running_var.shape)
 
     def _remove_inputs_for_ops(self):
         """
@@ -997,14 +991,15 @@ class ConnectedGraph(AimetCommonConnectedGraph):
                     del self._products[inp.name]
                 op.inputs = inputs_to_keep
 
-    def _create_and_add_param_product_if_not_exists(self, op: Op, product_name: str, shape: List[int]):
+    def _create_and_add_param_product_if_not_exists(self, op: Op, product_name: str,
+                                                    shape: Union[List[int], torch.Size]):
         """
         Given a name of a product, create it if it doesn't exist, and attach it to the specified op as a parameter.
         :param op: Op to connect the parameter product to.
         :param product_name: Name of the product to create.
         :param shape: Shape of the product to create.
         """
-        if product_name not in self._products.keys():
+        if product_name not in self._products:
             product = Product(product_name, shape)
             product.is_parm = True
             product.add_consumer(op)
@@ -1050,22 +1045,16 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param producer_to_product_name_map: Dictionary mapping op names to product names which the op produces.
         """
 
-        name = op.name
-        dotted_name = op.dotted_name
-
         # Get the output product names.
-        output_product_names = producer_to_product_name_map[dotted_name]
-
-        name_list = []
-        for prod_name in output_product_names:
-            to_pos = prod_name.find('to')
-            first_name = prod_name[:to_pos]
-            name_list.append(first_name)
+        output_product_names = producer_to_product_name_map[op.dotted_name]
 
         # Split ops have 2 or more output products
         if len(output_product_names) > 1:
-            name_list = [+1 for prod in name_list if name in prod]
-            if len(name_list) > 1:
+            # Ops sharing a module (e.g. a reused Relu) share a dotted name, so only count the products this op
+            # produces.
+            num_output_products = sum(1 for prod_name in output_product_names
+                                      if self._products[prod_name].producer is op)
+            if num_output_products > 1:
                 # Create a Split Op
                 split_op = self._create_split_op(op)
 
@@ -1128,7 +1117,7 @@ class ConnectedGraph(AimetCommonConnectedGraph):
 
         # 1. Create a new Product for Split Op's output.
         split_op_product = self._create_split_op_output_product(preceding_op, split_op)
-        producer_to_product_name_map[split_op_product.name].append(split_op_product)
+        producer_to_product_name_map[split_op.dotted_name].append(split_op_product.name)
         split_op.output = split_op_product
 
         # 2.This product has multiple consumers. Add the consumers to the Product.
@@ -1147,20 +1136,20 @@ class ConnectedGraph(AimetCommonConnectedGraph):
 
         # Since the preceding Op was behaving like a Split Op, it  would have 2 products with the preceding Op as the
         # producer. Delete these products from the product dictionary.
-        preceding_op_product_names = copy.deepcopy(producer_to_product_name_map[preceding_op.dotted_name])
-        for name in preceding_op_product_names:
+        remaining_product_names = []
+        for name in producer_to_product_name_map[preceding_op.dotted_name]:
             # Important Notes
             # The following check is needed since ResNet uses the same Relu twice in BasicBlock's forward()
             # Please read the details comments in _add_consumers_to_split_op_product()
-            if preceding_op.name in name:
-                deleted_product = self._products.pop(name)
-                try:
-                    producer_to_product_name_map[preceding_op.dotted_name].remove(deleted_product.name)
-                except ValueError as e:
-                    raise AssertionError(f'Product {deleted_product.name} not found in producer_to_product_name_map') from e
+            if self._products[name].producer is preceding_op:
+                del self._products[name]
+            else:
+                remaining_product_names.append(name)
 
         new_product_name = preceding_op.name + '__to__' + split_op.name
         new_product = self._add_product(new_product_name, new_product_shape)
+        remaining_product_names.append(new_product_name)
+        producer_to_product_name_map[preceding_op.dotted_name] = remaining_product_names
         new_product.producer = preceding_op
         preceding_op.output = new_product
         preceding_op.output.consumers.append(split_op)
@@ -1203,28 +1192,24 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param producer_to_product_name_map: Dictionary mapping op names to product names which the op produces.
         """
 
-        dotted_name = preceding_op.dotted_name
-        output_product_names = producer_to_product_name_map[dotted_name]
+        output_product_names = producer_to_product_name_map[preceding_op.dotted_name]
 
         # Important Notes
         # ResNet model uses the same Relu twice in the forward function of ResNet's BasicBlock.
         # The first Relu feeds in to the BasicBlock's Conv2.
         # The second Relu's output is split with one branch feeding the next BasicBlock's conv1 and the other
         # branch feeding in to the next BasicBlock's Add.
-        # The following line filters out the Relu whose output is NOT split :(
-        out_product_names = [name for name in output_product_names if preceding_op.name in name]
+        # Both Relu ops share a dotted name, so the following line filters out the Relu whose output is NOT split.
+        out_products = [self._products[name] for name in output_product_names
+                        if self._products[name].producer is preceding_op]
 
-        num_products = len(out_product_names)
-        consumer_index = 0
-        for a_product_index in range(num_products):
-            a_product = self.get_product(out_product_names[a_product_index])
+        for a_product in out_products:
             a_consumer = a_product.consumers[0]
             split_op_product.consumers.append(a_consumer)
             # Need to insert the newly created split_op product in the correct input index of the op
             input_product_index = determine_preceding_op_input_product_index_in_multi_input_op(preceding_op,
                                                                                                a_consumer)
             a_consumer.inputs[input_product_index] = split_op_product
-            consumer_index += 1
 
     def _is_recursive_parsing_needed(self, module: torch.nn.Module,
                                      trace: torch.jit.TracedModule) -> bool:
@@ -1238,12 +1223,19 @@ class ConnectedGraph(AimetCommonConnectedGraph):
         :param trace: torch.jit trace of the module
         :return: Boolean whether recursive parsing needed or not. If needed returns True, False otherwise.
         """
+        # NOTE: Modules shared across the model are referenced by multiple GetAttr nodes. Cache the result per module
+        #       to avoid walking the same trace graph every time.
+        recursive_parsing_needed = self._is_recursive_parsing_needed_cache.get(module)
+        if recursive_parsing_needed is not None:
+            return recursive_parsing_needed
+
         recursive_parsing_needed = True
         if is_torch_nn_leaf_module(module) or \
                 is_custom_leaf_module(module, self._find_aten_nodes_in_forward_pass(trace)) or \
                 isinstance(module, tuple(aimet_torch.utils.modules_to_treat_as_leaf)):
             recursive_parsing_needed = False
 
+        self._is_recursive_parsing_needed_cache[module] = recursive_parsing_needed
         return recursive_parsing_needed
 
     @staticmethod
@@ -1346,6 +1338,17 @@ class ConnectedGraph(AimetCommonConnectedGraph):
 
         return [op for (num, op) in sorted(op_num_dict.items(), key=lambda x: x[0])]
 
+
+@functools.lru_cache(None)
+def _parse_op_type_from_kind(kind: str) -> str:
+    """
+    Extract op type from node kind string. Same kinds appear many times in a trace, so the result is cached per kind
+    :param kind: node.kind() string e.g. aten::relu_, aten::size etc
+    :return: Op Type string
+    """
+    return kind.split("::")[-1].strip('_')
+
+
 def _create_module_to_op_dict(ops: List[Op]) -> Dict[torch.nn.Module, Op]:
     """
     Utility to create dictionary mapping pytorch modules to connected graph Ops
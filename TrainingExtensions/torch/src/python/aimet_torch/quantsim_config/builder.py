@@ -117,12 +117,14 @@ class LazyQuantizeWrapper(torch.nn.Module):
         """
         Changes all parameter quantizers (if any) to per-channel mode.
         """
-        for param_name, _ in self._module_to_wrap.named_parameters():
-            param_quantizer = self.param_quantizers[param_name]
+        is_conv_transpose = isinstance(self._module_to_wrap, (torch.nn.ConvTranspose1d,
+                                                              torch.nn.ConvTranspose2d,
+                                                              torch.nn.ConvTranspose3d))
+        # NOTE: param_quantizers is keyed by module_to_wrap.named_parameters() in __init__.
+        #       Iterate it directly instead of walking the module tree again
+        for param_name, param_quantizer in self.param_quantizers.items():
             channel_axis = 0
-            if isinstance(self._module_to_wrap, (torch.nn.ConvTranspose1d,
-                                                 torch.nn.ConvTranspose2d,
-                                                 torch.nn.ConvTranspose3d)):
+            if is_conv_transpose:
                 channel_axis = 1 if param_name == 'weight' else 0
 
             # pylint: disable = protected-access
@@ -38,7 +38,6 @@
 
 import abc
 import contextlib
-import itertools
 from typing import Type, List, Dict, Union, Iterable, Mapping, Optional
 
 import torch.nn as nn
@@ -59,6 +58,27 @@ def _no_op(in_tensor):
     return in_tensor
 
 
+@contextlib.contextmanager
+def _patch_forward(modules: Iterable[nn.Module], forward):
+    """
+    Temporarily overwrite the forward method of all the given modules at once
+    """
+    modules = list(modules)
+    # Forward methods directly assigned to the module instances, if any
+    orig_forwards = [module.__dict__.get('forward', None) for module in modules]
+
+    try:
+        for module in modules:
+            module.forward = forward
+        yield
+    finally:
+        for module, orig_forward in zip(modules, orig_forwards):
+            if orig_forward is None:
+                module.__dict__.pop('forward', None)
+            else:
+                module.forward = orig_forward
+
+
 class BaseQuantizationMixin(abc.ABC):
     """Mixin that implements quantization on top of regular pytorch modules.
 
@@ -147,9 +167,9 @@ class BaseQuantizationMixin(abc.ABC):
         if not params:
             return
 
-        with gathered_parameters(params.values()):
+        with gathered_parameters(params.values()), _patch_forward(params.keys(), _no_op):
             for param_qtzr, param in params.items():
-                with patch_attr(param_qtzr, "forward", _no_op), param_qtzr.compute_encodings():
+                with param_qtzr.compute_encodings():
                     _ = param_qtzr(param)
 
     def compute_param_encodings(self):
@@ -175,21 +195,16 @@ class BaseQuantizationMixin(abc.ABC):
         """
         self._compute_param_encodings(overwrite=True)
 
-        with contextlib.ExitStack() as stack:
-            input_quantizers = flatten_nn_module_list(self.input_quantizers)
-            output_quantizers = flatten_nn_module_list(self.output_quantizers)
-
-            for quantizer in itertools.chain(input_quantizers, output_quantizers):
-                if not isinstance(quantizer, QuantizerBase):
-                    continue
-
-                if not quantizer._allow_overwrite: # pylint: disable=protected-access
-                    continue
-
-                # Set input/output quantizers into pass-through mode during compute_encodings
-                # NOTE: This behavior is for backawrd-compatibility with V1 quantsim.
-                stack.enter_context(patch_attr(quantizer, 'forward', _no_op))
+        # pylint: disable=protected-access
+        quantizers = [
+            quantizer for quantizer in flatten_nn_module_list((self.input_quantizers, self.output_quantizers))
+            if isinstance(quantizer, QuantizerBase) and quantizer._allow_overwrite
+        ]
 
+        # Set input/output quantizers into pass-through mode during compute_encodings
+        # NOTE: This behavior is for backawrd-compatibility with V1 quantsim.
+        with _patch_forward(quantizers, _no_op), contextlib.ExitStack() as stack:
+            for quantizer in quantizers:
                 ctx = quantizer.compute_encodings()
                 stack.enter_context(ctx)
 
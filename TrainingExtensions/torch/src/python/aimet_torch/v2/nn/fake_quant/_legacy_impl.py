@@ -38,8 +38,7 @@
 """Fake-quantized modules (deprecated)"""
 
 from packaging import version
-from collections import OrderedDict
-from typing import Type, Optional, Tuple
+from typing import Type, Optional, Tuple, Any
 import abc
 import warnings
 
@@ -50,10 +49,24 @@ from torch.nn.modules.adaptive import _ASMoutput
 from torch.nn.utils.rnn import PackedSequence
 from torch.utils._pytree import tree_map
 
+from aimet_torch.v2.quantization.base import QuantizerBase
+from aimet_torch.v2.quantization.affine import AffineQuantizerBase
+from aimet_torch.v2.quantization.affine.quantizer import _is_computing_encodings as _is_quantizer_computing_encodings
 from ..base import BaseQuantizationMixin # pylint: disable=import-error
 from ..modules import custom # pylint: disable=import-error
 
 
+def _fake_quantize_if_applicable(data: Any, quantizer: Optional[QuantizerBase]):
+    """
+    Quantize data if quantizer is not None and data is a floating-point tensor
+    """
+    # NOTE: Check the quantizer first so that the common case of missing quantizers
+    #       doesn't pay for the isinstance and is_floating_point checks.
+    if quantizer and isinstance(data, Tensor) and data.is_floating_point():
+        return quantizer(data)
+    return data
+
+
 class FakeQuantMeta(abc.ABCMeta):
     """Sets :meth:`forward` to :meth:`quantized_forward` if only :meth:`quantized_forward` is defined
     """
@@ -125,8 +138,8 @@ class FakeQuantizationMixin(BaseQuantizationMixin, metaclass=FakeQuantMeta): # p
 
     """
 
-    cls_to_qcls = OrderedDict() # ouantized class -> original class
-    qcls_to_cls = OrderedDict() # original class -> quantized class
+    cls_to_qcls = {} # ouantized class -> original class
+    qcls_to_cls = {} # original class -> quantized class
 
     @abc.abstractmethod
     def forward(self, *args, **kwargs):
@@ -152,8 +165,9 @@ class FakeQuantizationMixin(BaseQuantizationMixin, metaclass=FakeQuantMeta): # p
         if not issubclass(module_cls, nn.Module):
             raise ValueError("Expected module_cls to be a subclass of torch.nn.Module. "
                              f"Got {module_cls}.")
-        if module_cls in cls.cls_to_qcls:
-            return cls.cls_to_qcls[module_cls]
+        quantized_cls = cls.cls_to_qcls.get(module_cls, None)
+        if quantized_cls is not None:
+            return quantized_cls
 
         quantized_cls_name = f"FakeQuantized{module_cls.__name__}"
         base_classes = (cls, module_cls)
@@ -164,17 +178,12 @@ class FakeQuantizationMixin(BaseQuantizationMixin, metaclass=FakeQuantMeta): # p
 class _FakeQuantizedUnaryOpMixin(FakeQuantizationMixin): # pylint: disable=abstract-method
     def forward(self, *args, **kwargs) -> Tensor: # pylint: disable=missing-function-docstring
         x, *others = args
-
-        if isinstance(x, Tensor) and x.is_floating_point() and self.input_quantizers[0]:
-            x = self.input_quantizers[0](x)
+        x = _fake_quantize_if_applicable(x, self.input_quantizers[0])
 
         with self._patch_quantized_parameters():
             output = super().forward(x, *others, **kwargs)
 
-        if isinstance(output, Tensor) and output.is_floating_point() and self.output_quantizers[0]:
-            output = self.output_quantizers[0](output)
-
-        return output
+        return _fake_quantize_if_applicable(output, self.output_quantizers[0])
 
 class _FakeQuantizedBinaryOpMixin(FakeQuantizationMixin): # pylint: disable=abstract-method
     def __quant_init__(self):
@@ -183,20 +192,15 @@ class _FakeQuantizedBinaryOpMixin(FakeQuantizationMixin): # pylint: disable=abst
 
     def forward(self, *args, **kwargs) -> Tensor: # pylint: disable=missing-function-docstring
         x, y, *others = args
-
-        if isinstance(x, Tensor) and x.is_floating_point() and self.input_quantizers[0]:
-            x = self.input_quantizers[0](x)
-
-        if isinstance(y, Tensor) and y.is_floating_point() and self.input_quantizers[1]:
-            y = self.input_quantizers[1](y)
+        # NOTE: Unpacking ModuleList is cheaper than indexing it multiple times
+        x_quantizer, y_quantizer = self.input_quantizers
+        x = _fake_quantize_if_applicable(x, x_quantizer)
+        y = _fake_quantize_if_applicable(y, y_quantizer)
 
         with self._patch_quantized_parameters():
             output = super().forward(x, y, *others, **kwargs)
 
-        if isinstance(output, Tensor) and output.is_floating_point() and self.output_quantizers[0]:
-            output = self.output_quantizers[0](output)
-
-        return output
+        return _fake_quantize_if_applicable(output, self.output_quantizers[0])
 
 class _FakeQuantizedTernaryOpMixin(FakeQuantizationMixin): # pylint: disable=abstract-method
     def __quant_init__(self):
@@ -205,23 +209,16 @@ class _FakeQuantizedTernaryOpMixin(FakeQuantizationMixin): # pylint: disable=abs
 
     def forward(self, *args, **kwargs) -> Tensor: # pylint: disable=missing-function-docstring
         x, y, z, *others = args
-
-        if isinstance(x, Tensor) and x.is_floating_point() and self.input_quantizers[0]:
-            x = self.input_quantizers[0](x)
-
-        if isinstance(y, Tensor) and y.is_floating_point() and self.input_quantizers[1]:
-            y = self.input_quantizers[1](y)
-
-        if isinstance(z, Tensor) and z.is_floating_point() and self.input_quantizers[2]:
-            z = self.input_quantizers[2](z)
+        # NOTE: Unpacking ModuleList is cheaper than indexing it multiple times
+        x_quantizer, y_quantizer, z_quantizer = self.input_quantizers
+        x = _fake_quantize_if_applicable(x, x_quantizer)
+        y = _fake_quantize_if_applicable(y, y_quantizer)
+        z = _fake_quantize_if_applicable(z, z_quantizer)
 
         with self._patch_quantized_parameters():
             output = super().forward(x, y, z, *others, **kwargs)
 
-        if isinstance(output, Tensor) and output.is_floating_point() and self.output_quantizers[0]:
-            output = self.output_quantizers[0](output)
-
-        return output
+        return _fake_quantize_if_applicable(output, self.output_quantizers[0])
 
 
 
@@ -910,6 +907,17 @@ class FakeQuantizedSplit(FakeQuantizationMixin, custom.Split):
         if x.is_floating_point() and self.input_quantizers[0]:
             x = self.input_quantizers[0](x)
 
+        output_quantizer = self.output_quantizers[0]
+
+        if isinstance(output_quantizer, AffineQuantizerBase) and output_quantizer.shape == () and \
+                x.is_floating_point() and not _is_quantizer_computing_encodings(output_quantizer):
+            # All the outputs are partitions of the input sharing the same per-tensor output quantizer.
+            # Quantize the input all at once and split it into views instead of
+            # quantizing each output separately.
+            # NOTE: Not applicable while computing encodings, since the encoding analyzer
+            #       is expected to observe each output separately
+            return super().forward(output_quantizer(x), *others, **kwargs)
+
         outputs = super().forward(x, *others, **kwargs)
 
         if self.output_quantizers[0]:
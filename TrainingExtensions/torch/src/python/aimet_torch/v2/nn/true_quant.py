@@ -41,8 +41,7 @@ from packaging import version
 import contextlib
 import itertools
 from abc import abstractmethod, ABCMeta
-from collections import OrderedDict
-from typing import Type, Any, Optional, Callable, Dict
+from typing import Type, Any, Optional, Callable, Dict, Tuple
 from weakref import WeakKeyDictionary
 import warnings
 
@@ -117,6 +116,41 @@ def _exit_compute_encodings(qmodule):
     _QUANTIZED_MODULES_UNDER_COMPUTE_ENCODINGS[qmodule] -= 1
 
 
+# qmodule -> {param name -> (quantized param, param version, param encoding, encoding version, dequantized param)}
+_DEQUANTIZED_PARAMETERS = WeakKeyDictionary()
+
+
+def _get_encoding_version(encoding) -> Tuple[int, ...]:
+    """
+    Returns the version counters of all the tensors held by the encoding
+    """
+    # pylint: disable=protected-access
+    return tuple(value._version for value in vars(encoding).values() if isinstance(value, Tensor))
+
+
+# qmodule -> (kernel, compiled kernel)
+# NOTE: Keyed by module rather than by kernel since compiled kernels hold
+#       a strong reference to the original kernel, which would keep the key alive forever
+_COMPILED_KERNELS = WeakKeyDictionary()
+
+
+def _compile_kernel(qmodule: nn.Module, kernel: Callable) -> Callable:
+    """
+    Returns torch.compile'd kernel, compiling it only once per module and kernel
+    """
+    cached_kernel, compiled_kernel = _COMPILED_KERNELS.get(qmodule, (None, None))
+
+    if cached_kernel is not kernel:
+        if version.parse(torch.__version__) < version.parse("2.0.0"):
+            raise RuntimeError("QuantizationMixin.use_torch_compile requires torch>=2.0.0. "
+                               f"Got torch=={torch.__version__}")
+        # Compile with dynamic shapes to avoid recompilation across varying batch sizes
+        compiled_kernel = torch.compile(kernel, dynamic=True)
+        _COMPILED_KERNELS[qmodule] = (kernel, compiled_kernel)
+
+    return compiled_kernel
+
+
 class QuantizationMixinMeta(ABCMeta):
     """Sets :meth:`forward` to :meth:`quantized_forward` if only :meth:`quantized_forward` is defined
     """
@@ -185,12 +219,19 @@ class QuantizationMixin(BaseQuantizationMixin, metaclass=QuantizationMixinMeta):
 
     """
 
-    cls_to_qcls = OrderedDict()  # quantized class -> original class
-    qcls_to_cls = OrderedDict()  # original class -> quantized class
+    cls_to_qcls = {}  # quantized class -> original class
+    qcls_to_cls = {}  # original class -> quantized class
 
     _default_kernel: Optional[Callable] = None
     _kernels = WeakKeyDictionary()  # instance -> instance_kernel
 
+    # If True, custom kernels are compiled with torch.compile upon their first invocation
+    use_torch_compile: bool = False
+
+    # If True, pre-quantized nn.Parameters are dequantized only once and reused across
+    # forward passes under no_grad, at the cost of keeping a dequantized copy in memory
+    cache_dequantized_parameters: bool = False
+
     @abstractmethod
     def forward(self, *args, **kwargs):
         """Computes a quantized version of the parent module's forward method.
@@ -296,9 +337,11 @@ class QuantizationMixin(BaseQuantizationMixin, metaclass=QuantizationMixinMeta):
             The kernel to be used by this instance.
 
         """
-        if self in QuantizationMixin._kernels:
+        try:
+            # NOTE: Look up only once, since each lookup in WeakKeyDictionary creates a new weakref
             return QuantizationMixin._kernels[self]
-        return self.get_default_kernel()
+        except KeyError:
+            return self.get_default_kernel()
 
     @contextlib.contextmanager
     def compute_encodings(self):  # pylint: disable=missing-function-docstring
@@ -311,11 +354,45 @@ class QuantizationMixin(BaseQuantizationMixin, metaclass=QuantizationMixinMeta):
         stack = contextlib.ExitStack()
         for param_name, _ in self.param_quantizers.items():
             qparam = getattr(self, param_name)
-            ctx = patch_attr(self, param_name, _dequantize_if_applicable(qparam))
+            if not isinstance(qparam, QuantizedTensorBase):
+                continue
+            ctx = patch_attr(self, param_name, self._dequantize_parameter(param_name, qparam))
             stack.enter_context(ctx)
 
         return stack
 
+    def _dequantize_parameter(self, param_name: str, qparam: QuantizedTensorBase) -> Tensor:
+        """
+        Dequantize a quantized parameter. If QuantizationMixin.cache_dequantized_parameters is True,
+        reuse the previous result if the parameter is a persistent nn.Parameter
+        whose data and encoding haven't changed since then.
+        """
+        if not QuantizationMixin.cache_dequantized_parameters or \
+                torch.is_grad_enabled() or \
+                not isinstance(qparam, nn.Parameter):
+            # Transient quantized tensors (e.g. outputs of param quantizers) are never reused,
+            # and dequantized outputs can't be shared across multiple autograd graphs
+            return qparam.dequantize()
+
+        cache = _DEQUANTIZED_PARAMETERS.setdefault(self, {})
+        cached = cache.get(param_name, None)
+        encoding = qparam.encoding
+        encoding_version = _get_encoding_version(encoding)
+
+        if cached is not None:
+            cached_param, cached_version, cached_encoding, cached_encoding_version, dequantized = cached
+            # pylint: disable=protected-access
+            if cached_param is qparam and \
+                    cached_version == qparam._version and \
+                    cached_encoding is encoding and \
+                    cached_encoding_version == encoding_version:
+                return dequantized
+
+        dequantized = qparam.dequantize()
+        # pylint: disable=protected-access
+        cache[param_name] = (qparam, qparam._version, encoding, encoding_version, dequantized)
+        return dequantized
+
     @classmethod
     def wrap(cls, module_cls: Type[nn.Module]) -> Type[nn.Module]:
         """
@@ -324,8 +401,9 @@ class QuantizationMixin(BaseQuantizationMixin, metaclass=QuantizationMixinMeta):
         if not issubclass(module_cls, nn.Module):
             raise ValueError("Expected module_cls to be a subclass of torch.nn.Module. "
                              f"Got {module_cls}.")
-        if module_cls in cls.cls_to_qcls:
-            return cls.cls_to_qcls[module_cls]
+        quantized_cls = cls.cls_to_qcls.get(module_cls, None)
+        if quantized_cls is not None:
+            return quantized_cls
 
         quantized_cls_name = f"Quantized{module_cls.__name__}"
         base_classes = (cls, module_cls)
@@ -363,6 +441,12 @@ class _Dispatcher(BaseTorchFunctionMode):
 _dispatcher = _Dispatcher()
 _stack_level = 0
 
+
+def _unsupported_override_error(torch_func: Callable) -> RuntimeError:
+    # NOTE: Error message formatting is kept out of the hot dispatch path
+    return RuntimeError(f"PyTorch doesn't support overriding {torch_func}")
+
+
 @contextlib.contextmanager
 def _dispatch(torch_func: Callable, custom_impl: Callable):
     # pylint: disable=global-statement
@@ -372,7 +456,7 @@ def _dispatch(torch_func: Callable, custom_impl: Callable):
     try:
         orig = _dispatch_table[torch_func]
     except KeyError as e:
-        raise RuntimeError(f"PyTorch doesn't support overriding {torch_func}") from e
+        raise _unsupported_override_error(torch_func) from e
 
     try:
         _dispatch_table[torch_func] = custom_impl
@@ -398,7 +482,7 @@ class _DispatchMeta(QuantizationMixinMeta):
         if '_builtin_torch_fn' in namespace:
             torch_fn = namespace['_builtin_torch_fn']
             if torch_fn and torch_fn not in _dispatch_table:
-                raise RuntimeError(f"PyTorch doesn't support overriding {torch_fn}")
+                raise _unsupported_override_error(torch_fn)
         return super().__new__(mcs, name, bases, namespace, **kwargs)
 
 
@@ -414,16 +498,24 @@ class _DispatchMixin(metaclass=_DispatchMeta):
 
         if not kernel or _is_computing_encodings(self):
             kernel = self._builtin_torch_fn_helper(builtin_torch_fn)
+            # Builtin torch functions consume dequantized parameters
+            dequantize_params = self._patch_dequantized_parameters
         else:
+            if QuantizationMixin.use_torch_compile:
+                kernel = _compile_kernel(self, kernel)
             kernel = self._custom_kernel_helper(kernel)
+            dequantize_params = contextlib.nullcontext
 
-        with self._patch_quantized_parameters():
+        with self._patch_quantized_parameters(), dequantize_params():
             with _dispatch(builtin_torch_fn, kernel):
                 output = super().forward(*args, **kwargs)
 
         return _dequantize_if_applicable(output)
 
     def _builtin_torch_fn_helper(self, fn: Callable[..., Tensor]):
+        if len(self.input_quantizers) == 1:
+            return self._unary_builtin_torch_fn_helper(fn)
+
         def wrapper(*args, **kwargs):
             qtzd_args = (
                 _quantize_dequantize_if_applicable(x, qtzr)
@@ -444,6 +536,29 @@ class _DispatchMixin(metaclass=_DispatchMeta):
 
         return wrapper
 
+    def _unary_builtin_torch_fn_helper(self, fn: Callable[..., Tensor]):
+        """
+        Specialization of :meth:`_builtin_torch_fn_helper` for the most common case
+        where only the first argument is subject to input quantization.
+        Quantizers are looked up upon every call since they can be replaced at any time
+        """
+        def wrapper(*args, **kwargs):
+            if args:
+                x, *others = args
+                args = (_quantize_dequantize_if_applicable(x, self.input_quantizers[0]),
+                        *(_dequantize_if_applicable(other) for other in others))
+            if kwargs:
+                kwargs = {
+                    key: _dequantize_if_applicable(value)
+                    for key, value in kwargs.items()
+                }
+
+            output = fn(*args, **kwargs)
+
+            return _quantize_dequantize_if_applicable(output, self.output_quantizers[0])
+
+        return wrapper
+
     def _custom_kernel_helper(self, fn: Callable[..., QuantizedTensorBase]):
         def wrapper(*args, **kwargs):
             qtzd_args = (
@@ -1297,6 +1412,15 @@ class QuantizedLinear(_DispatchMixin, QuantizationMixin, nn.Linear):
     # This is mainly to reduce memory footprint of QAT of large language models.
     @allow_recompute
     def forward(self, *args, **kwargs):
+        if not self.get_kernel() or _is_computing_encodings(self):
+            # Fast path for fallback to F.linear. (e.g. weight-only quantization)
+            # Since nn.Linear.forward is merely a call to F.linear, call F.linear
+            # directly without going through the dispatch mechanism
+            linear = self._builtin_torch_fn_helper(type(self)._builtin_torch_fn)
+            with self._patch_quantized_parameters(), self._patch_dequantized_parameters():
+                output = linear(*args, **kwargs, weight=self.weight, bias=self.bias)
+            return _dequantize_if_applicable(output)
+
         # Workaround for deepspeed.
         # Deepspeed zero3 sometimes forcefully mokey-patches F.linear to torch.addmm,
         # which collides with the core assumption of our dispatch mechanism
@@ -1306,6 +1430,16 @@ class QuantizedLinear(_DispatchMixin, QuantizationMixin, nn.Linear):
         with patch_attr(F, 'linear', type(self)._builtin_torch_fn):
             return super().forward(*args, **kwargs)
 
+    # NOTE: Specialized for F.linear(input, weight, bias) to avoid
+    #       the generic argument handling overhead of _DispatchMixin
+    def _builtin_torch_fn_helper(self, fn: Callable[..., Tensor]):
+        def linear(input, weight, bias=None):
+            input = _quantize_dequantize_if_applicable(input, self.input_quantizers[0])
+            output = fn(input, _dequantize_if_applicable(weight), _dequantize_if_applicable(bias))
+            return _quantize_dequantize_if_applicable(output, self.output_quantizers[0])
+
+        return linear
+
 
 @QuantizationMixin.implements(nn.LocalResponseNorm)
 class QuantizedLocalResponseNorm(_DispatchMixin, QuantizationMixin, nn.LocalResponseNorm):
@@ -237,8 +237,6 @@ class AffineEncoding(EncodingBase, _GridMixin):
         return type(self)(scale, offset, self.qmin, self.qmax, self._symmetry, **properties)
 
     def quantize(self, input: torch.Tensor) -> torch.Tensor:
-        scale = self.scale
-        offset = self.offset
         qmin = self.qmin
         qmax = self.qmax
         block_size = self.block_size
@@ -246,36 +244,50 @@ class AffineEncoding(EncodingBase, _GridMixin):
         # Subclasses of torch.Tensor with custom __torch_function__ (in our case, QuantizedTensorBase)
         # is known to introduce substantial CPU overhead.
         # Cast types of the inputs to plain torch.Tensor for faster execution.
-        return quantize(input.as_subclass(torch.Tensor),
-                        scale.to(input.dtype).as_subclass(torch.Tensor),
-                        offset.to(input.dtype).as_subclass(torch.Tensor),
-                        qmin, qmax, block_size=block_size)
+        input = input.as_subclass(torch.Tensor)
+        scale, offset = self._cast_params(input.dtype)
+        return quantize(input, scale, offset, qmin, qmax, block_size=block_size)
 
     def dequantize(self, input: torch.Tensor) -> torch.Tensor:
-        scale = self.scale
-        offset = self.offset
         block_size = self.block_size
 
         # Subclasses of torch.Tensor with custom __torch_function__ (in our case, QuantizedTensorBase)
         # is known to introduce substantial CPU overhead.
         # Cast types of the inputs to plain torch.Tensor for faster execution.
-        return dequantize(input.as_subclass(torch.Tensor),
-                          scale.to(input.dtype).as_subclass(torch.Tensor),
-                          offset.to(input.dtype).as_subclass(torch.Tensor),
-                          block_size=block_size)
+        input = input.as_subclass(torch.Tensor)
+        scale, offset = self._cast_params(input.dtype)
+        return dequantize(input, scale, offset, block_size=block_size)
+
+    def _cast_params(self, dtype: torch.dtype) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Returns scale and offset as plain torch.Tensor of the given dtype.
+        Skips the casts altogether in the common case where the dtypes already match.
+        """
+        scale = self.scale.as_subclass(torch.Tensor)
+        offset = self.offset.as_subclass(torch.Tensor)
+        if scale.dtype != dtype:
+            scale = scale.to(dtype)
+        if offset.dtype != dtype:
+            offset = offset.to(dtype)
+        return scale, offset
 
     def _to_legacy_format(self):
-        min = self.min.flatten()
-        max = self.max.flatten()
-        scale = self.scale.flatten()
+        # NOTE: Convert each tensor to a python list in bulk.
+        #       Converting element by element would trigger one device-to-host copy per element.
+        min = self.min.flatten().tolist()
+        max = self.max.flatten().tolist()
+        scale = self.scale.flatten().tolist()
 
         # Legacy behavior is to shift offset by qmin
-        offset = self.offset.flatten() + self.qmin
+        offset = (self.offset.flatten() + self.qmin).tolist()
+
+        bitwidth = self.bitwidth
+        is_symmetric = str(self.symmetry)
 
         return [
             {'min': float(min_), 'max': float(max_),
              'scale': float(scale_), 'offset': int(offset_),
-             'bitwidth': self.bitwidth, 'dtype': 'int', 'is_symmetric': str(self.symmetry)}
+             'bitwidth': bitwidth, 'dtype': 'int', 'is_symmetric': is_symmetric}
             for min_, max_, scale_, offset_ in zip(min, max, scale, offset)
         ]
 
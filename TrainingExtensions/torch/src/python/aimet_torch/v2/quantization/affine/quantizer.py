@@ -41,7 +41,9 @@ import abc
 from itertools import chain, repeat
 from typing import Optional, List, Dict, Tuple, overload
 import contextlib
+import copy
 import functools
+from weakref import WeakKeyDictionary
 
 import torch
 from torch import nn
@@ -60,6 +62,49 @@ __all__ = ['AffineQuantizerBase', 'MinMaxQuantizer', 'Quantize', 'QuantizeDequan
            'GroupedBlockQuantizeDequantize']
 
 
+_MISSING = object()
+
+
+def _restore_dict_entry(obj, name: str, orig):
+    if orig is _MISSING:
+        obj.__dict__.pop(name, None)
+    else:
+        obj.__dict__[name] = orig
+
+
+# quantizer -> (min, max, cache key, encoding)
+# Holds the last encoding computed by each quantizer while autograd is disabled.
+_CACHED_ENCODINGS = WeakKeyDictionary()
+
+
+_QUANTIZERS_UNDER_COMPUTE_ENCODINGS = WeakKeyDictionary()
+
+
+def _is_computing_encodings(quantizer) -> bool:
+    return _QUANTIZERS_UNDER_COMPUTE_ENCODINGS.get(quantizer, 0) > 0
+
+
+def _is_compiling() -> bool:
+    if hasattr(torch, 'compiler') and hasattr(torch.compiler, 'is_compiling'):
+        return torch.compiler.is_compiling()
+
+    try:
+        return torch._dynamo.is_compiling() # pylint: disable=protected-access
+    except AttributeError:
+        return False
+
+
+def _is_encoding_cache_enabled(quantizer) -> bool:
+    # NOTE: Encodings must be computed from scratch
+    #   * while tracing/compiling, so that scale and offset are recorded as
+    #     operations on min/max rather than frozen as constants, and
+    #   * while computing encodings, since min/max are transient batch statistics
+    return not (torch.jit.is_tracing() or
+                torch.onnx.is_in_onnx_export() or
+                _is_compiling() or
+                _is_computing_encodings(quantizer))
+
+
 
 class AffineQuantizerBase(QuantizerBase, _GridMixin):
     """
@@ -258,8 +303,10 @@ class AffineQuantizerBase(QuantizerBase, _GridMixin):
         self.qmin, self.qmax = _derive_qmin_qmax(bitwidth=bitwidth, signed=symmetric)
         self.symmetric = symmetric
         # Note: We can only accurately infer signed-ness in the symmetric case, but AIMET uses unsigned for asymmetric
-        min_ = torch.tensor([e['min'] for e in encodings]).view(self.shape)
-        max_ = torch.tensor([e['max'] for e in encodings]).view(self.shape)
+        # Build min and max with a single pass over the encodings and a single tensor allocation
+        min_max = torch.tensor([(e['min'], e['max']) for e in encodings])
+        min_ = min_max[:, 0].reshape(self.shape)
+        max_ = min_max[:, 1].reshape(self.shape)
         self.set_range(min_, max_)
 
     def extra_repr(self) -> str:
@@ -308,10 +355,15 @@ class MinMaxQuantizer(AffineQuantizerBase): # pylint: disable=abstract-method
     min: torch.nn.Parameter
     max: torch.nn.Parameter
 
+    # If True, get_encoding() under no_grad reuses the previous encoding as long as min and max haven't changed.
+    # NOTE: Updates through .data (e.g. self.min.data.copy_(...)) don't bump the parameter version
+    #       and are not detected. Use set_range() or in-place updates under no_grad instead.
+    cache_encodings: bool = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.register_quantization_parameter('min', nn.Parameter(-torch.ones(self.shape)))
+        self.register_quantization_parameter('min', nn.Parameter(torch.full(self.shape, -1.)))
         self.register_quantization_parameter('max', nn.Parameter(torch.ones(self.shape)))
 
     @contextlib.contextmanager
@@ -345,15 +397,29 @@ class MinMaxQuantizer(AffineQuantizerBase): # pylint: disable=abstract-method
             dynamic_max = dynamic_max.to(dtype=self.max.dtype,
                                          device=self.max.device).expand_as(self.max)
 
-            with patch_attr(self, 'min', dynamic_min),\
-                    patch_attr(self, 'max', dynamic_max):
+            # NOTE: Equivalent to patch_attr(self, 'min', ...) and patch_attr(self, 'max', ...),
+            #       but swaps self.__dict__ entries directly since this runs on every calibration batch.
+            #       See aimet_torch.v2.utils._patch_param_or_buffer for why __dict__ takes precedence.
+            orig_min = self.__dict__.get('min', _MISSING)
+            orig_max = self.__dict__.get('max', _MISSING)
+            self.__dict__['min'] = dynamic_min
+            self.__dict__['max'] = dynamic_max
+            try:
                 return original_forward(input)
+            finally:
+                _restore_dict_entry(self, 'min', orig_min)
+                _restore_dict_entry(self, 'max', orig_max)
 
         self.encoding_analyzer.reset_stats()
+        _CACHED_ENCODINGS.pop(self, None)
 
         try:
             with patch_attr(self, 'forward', forward_wrapper):
-                yield
+                _QUANTIZERS_UNDER_COMPUTE_ENCODINGS[self] = _QUANTIZERS_UNDER_COMPUTE_ENCODINGS.get(self, 0) + 1
+                try:
+                    yield
+                finally:
+                    _QUANTIZERS_UNDER_COMPUTE_ENCODINGS[self] -= 1
         except: # pylint: disable=try-except-raise
             raise
         else:
@@ -385,7 +451,8 @@ class MinMaxQuantizer(AffineQuantizerBase): # pylint: disable=abstract-method
         """
         if not self.is_initialized():
             return None
-        return self.get_scale(dtype) * (self.get_offset(dtype) + self.qmin)
+        scale, offset = self._get_scale_and_offset(dtype)
+        return scale * (offset + self.qmin)
 
     def get_max(self, dtype=None) -> Optional[torch.Tensor]:
         """
@@ -399,7 +466,8 @@ class MinMaxQuantizer(AffineQuantizerBase): # pylint: disable=abstract-method
         """
         if not self.is_initialized():
             return None
-        return self.get_scale(dtype) * (self.get_offset(dtype) + self.qmax)
+        scale, offset = self._get_scale_and_offset(dtype)
+        return scale * (offset + self.qmax)
 
     def get_scale(self, dtype=None) -> Optional[torch.Tensor]:
         """
@@ -427,14 +495,76 @@ class MinMaxQuantizer(AffineQuantizerBase): # pylint: disable=abstract-method
         if not self.is_initialized():
             return None
 
+        if self.symmetric:
+            # Symmetric offset doesn't depend on the scale. Skip computing it
+            return self._get_symmetric_offset(dtype or torch.float32)
+
+        _, offset = self._get_scale_and_offset(dtype)
+        return offset
+
+    def _get_symmetric_offset(self, dtype: torch.dtype) -> torch.Tensor:
+        # NOTE: Create the zero offset directly with the target dtype and device.
+        #       Unlike the asymmetric case, no cast or rounding graph is needed.
+        return torch.zeros(self.min.shape, dtype=dtype, device=self.min.device)
+
+    def _get_scale_and_offset(self, dtype=None) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Compute quantization scale and offset together so that the scale is computed only once.
+        Assumes that the quantizer is initialized.
+        """
         dtype = dtype or torch.float32
+        scale = self.get_scale(dtype)
 
         if self.symmetric:
-            offset = torch.zeros_like(self.min, requires_grad=False, dtype=dtype)
-        else:
-            offset = ste_round(self.min.to(dtype) / self.get_scale(dtype)) - self.qmin
+            return scale, self._get_symmetric_offset(dtype)
 
-        return offset.to(dtype)
+        offset = ste_round(self.min.to(dtype) / scale) - self.qmin
+        return scale, offset.to(dtype)
+
+    def get_encoding(self) -> Optional[AffineEncoding]:
+        """
+        Return the quantizer's encodings as an AffineEncoding object
+        """
+        if not self.is_initialized():
+            return None
+
+        if not MinMaxQuantizer.cache_encodings or \
+                torch.is_grad_enabled() or \
+                not _is_encoding_cache_enabled(self):
+            # Encodings computed with autograd enabled are bound to the current graph
+            # and can't be reused across forward passes
+            return self._compute_encoding()
+
+        min, max = self.min, self.max
+        key = self._get_encoding_cache_key()
+        cached_min, cached_max, cached_key, cached_encoding = _CACHED_ENCODINGS.get(self, (None, None, None, None))
+
+        if cached_min is min and cached_max is max and cached_key == key:
+            # Encodings are mutable (e.g. encoding.bitwidth = ...).
+            # Hand out a shallow copy so that callers can't corrupt the cache
+            return copy.copy(cached_encoding)
+
+        encoding = self._compute_encoding()
+        _CACHED_ENCODINGS[self] = (min, max, key, encoding)
+        return copy.copy(encoding)
+
+    def _compute_encoding(self) -> AffineEncoding:
+        scale, offset = self._get_scale_and_offset(torch.float32)
+        return AffineEncoding(scale, offset, self.qmin, self.qmax, self._symmetric, self.block_size)
+
+    def _get_encoding_cache_key(self) -> Tuple:
+        """
+        Returns a key that changes whenever the result of get_encoding() may change,
+        provided that self.min and self.max are still the same objects.
+        """
+        # NOTE: Parameters can be modified in-place, moved by nn.Module.to(),
+        #       or have their data reassigned (e.g. by deepspeed zero3 partitioning).
+        #       Track version, data pointer, dtype and device of each parameter.
+        min, max = self.min, self.max
+        # pylint: disable=protected-access
+        return (min._version, min.data_ptr(), min.dtype, min.device,
+                max._version, max.data_ptr(), max.dtype, max.device,
+                self.qmin, self.qmax, self.symmetric, self.block_size)
 
     def set_range(self, min: torch.Tensor, max: torch.Tensor):
         """
@@ -539,14 +669,16 @@ class Quantize(MinMaxQuantizer):
             Quantized output
 
         """
-        if not self.is_initialized():
+        # NOTE: get_encoding() returns None if and only if the quantizer is not initialized.
+        #       Checking its return value saves a separate call to self.is_initialized().
+        encoding = self.get_encoding()
+
+        if encoding is None:
             raise RuntimeError(
                 'Failed to run Quantize since quantization parameters are not initialized.'
                 ' Please initialize the quantization parameters using `compute_encodings()`.'
             )
 
-        encoding = self.get_encoding()
-
         # Subclasses of torch.Tensor with custom __torch_function__ (in our case, QuantizedTensorBase)
         # is known to introduce substantial CPU overhead.
         # Cast types of the inputs to plain torch.Tensor for faster execution.
@@ -673,14 +805,16 @@ class QuantizeDequantize(MinMaxQuantizer):
             Quantize-dequantized output
 
         """
-        if not self.is_initialized():
+        # NOTE: get_encoding() returns None if and only if the quantizer is not initialized.
+        #       Checking its return value saves a separate call to self.is_initialized().
+        encoding = self.get_encoding()
+
+        if encoding is None:
             raise RuntimeError(
                 'Failed to run QuantizeDequantize since quantization parameters are not initialized.'
                 ' Please initialize the quantization parameters using `compute_encodings()`.'
             )
 
-        encoding = self.get_encoding()
-
         # Subclasses of torch.Tensor with custom __torch_function__ (in our case, QuantizedTensorBase)
         # is known to introduce substantial CPU overhead.
         # Cast types of the inputs to plain torch.Tensor for faster execution.
@@ -764,14 +898,19 @@ class GroupedBlockQuantizeDequantize(QuantizeDequantize): # pylint: disable=too-
         orig_scale_shape = orig_scale.shape
         reshaped_scale = orig_scale.view(self.get_expanded_scale_shape())
         max_scale = torch.amax(reshaped_scale, list(range(1, len(orig_scale_shape) * 2, 2)), keepdim=True)
-        per_channel_scale = max_scale / 2 ** (self.decompressed_bw - self.bitwidth)
+        # NOTE: self.bitwidth is derived from qmin/qmax on every access. Evaluate it only once.
+        num_integer_scale_steps = 2 ** (self.decompressed_bw - self.bitwidth)
+        per_channel_scale = max_scale / num_integer_scale_steps
         updated_scale = quantize_dequantize(reshaped_scale,
                                             scale=per_channel_scale,
                                             offset=torch.zeros_like(per_channel_scale),
                                             qmin=1,
-                                            qmax=2 ** (self.decompressed_bw - self.bitwidth))
+                                            qmax=num_integer_scale_steps)
         return updated_scale.view(orig_scale_shape)
 
+    def _get_encoding_cache_key(self) -> Tuple:
+        return (*super()._get_encoding_cache_key(), self.decompressed_bw, self.block_grouping)
+
     def get_expanded_scale_shape(self) -> Tuple[int, ...]:
         """
         Get expanded scale shape which breaks each scale dimension into a pair of dimensions with sizes
@@ -810,6 +949,7 @@ class GroupedBlockQuantizeDequantize(QuantizeDequantize): # pylint: disable=too-
         :return: Per block integer scale
         """
         per_channel_scale = self.get_per_channel_scale()
-        expanded_scale = self.get_scale().view(self.get_expanded_scale_shape())
-        integer_scale = torch.round(expanded_scale / per_channel_scale).int().view(self.get_scale().shape)
+        scale = self.get_scale()
+        expanded_scale = scale.view(self.get_expanded_scale_shape())
+        integer_scale = torch.round(expanded_scale / per_channel_scale).int().view(scale.shape)
         return integer_scale
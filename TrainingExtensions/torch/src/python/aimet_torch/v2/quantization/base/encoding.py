@@ -96,6 +96,15 @@ class EncodingBase(abc.ABC):
         :return: Dequantized tensor
         """
 
+    def __copy__(self) -> "EncodingBase":
+        # NOTE: Encodings are shallow-copied every time a quantized tensor is
+        #       quantized, dequantized, or passed through a per-tensor op.
+        #       Copying __dict__ directly is considerably cheaper than the
+        #       default __reduce_ex__-based protocol used by copy.copy.
+        self_copy = object.__new__(type(self))
+        self_copy.__dict__.update(self.__dict__)
+        return self_copy
+
     def _detach(self) -> "EncodingBase":
         """
         Returns a new encoding object with all tensors attributes detached from the current graph
@@ -1333,6 +1333,27 @@ class ModelWithReluAfterSplit(nn.Module):
         return self.relu1(chunks[0]), self.relu2(chunks[1]), self.relu3(chunks[2])
 
 
+class ModelWithSplitOutputsUsedByMultipleOps(nn.Module):
+    """ Model whose split outputs are each used by multiple ops """
+    def __init__(self):
+        super().__init__()
+        self.conv1 = nn.Conv2d(3, 8, kernel_size=3, padding=1)
+        self.split = aimet_modules.Split()
+        self.relu1 = nn.ReLU()
+        self.conv2 = nn.Conv2d(4, 4, kernel_size=1)
+        self.relu2 = nn.ReLU()
+        self.conv3 = nn.Conv2d(4, 4, kernel_size=1)
+        self.conv4 = nn.Conv2d(8, 8, kernel_size=1)
+        self.add1 = aimet_modules.Add()
+        self.add2 = aimet_modules.Add()
+
+    def forward(self, *inputs):
+        x = self.conv1(inputs[0])
+        y = self.conv4(x)
+        a, b = self.split(x, 4, 1)
+        return self.add1(self.relu1(a), self.conv2(a)), self.add2(self.relu2(b), self.conv3(b)), y
+
+
 class ModuleList(torch.nn.Module):
     def __init__(self):
         super().__init__()
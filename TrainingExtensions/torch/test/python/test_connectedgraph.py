@@ -42,6 +42,7 @@ import unittest.mock
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torchvision import models
 
 import aimet_torch.utils
 from aimet_common.connected_graph.connectedgraph_utils import get_all_input_ops, get_all_output_ops,\
@@ -553,6 +554,169 @@ class TestConnectedGraph(unittest.TestCase):
         # ordered_ops filter out SplitOp inserted by ConnectedGraph
         self.assertEqual(4, len(connected_graph.ordered_ops))
 
+    def test_split_outputs_used_by_multiple_ops(self):
+        """ Test building ConnectedGraph on a model whose split outputs are each used by multiple ops """
+        model = test_models.ModelWithSplitOutputsUsedByMultipleOps().eval()
+        inp_tensor_list = create_rand_tensors_given_shapes((1, 3, 8, 8), get_device(model))
+        conn_graph = ConnectedGraph(model, inp_tensor_list)
+
+        # One split op for conv1 and one split op for the split module
+        self.assertEqual(2, conn_graph._split_count)
+        products = conn_graph.get_all_products()
+        module_to_op = {op.get_module(): op for op in conn_graph.get_all_ops().values() if op.get_module() is not None}
+
+        for preceding_module, consumer_modules in [(model.conv1, {model.conv4, model.split}),
+                                                   (model.split, {model.relu1, model.conv2,
+                                                                  model.relu2, model.conv3})]:
+            preceding_op = module_to_op[preceding_module]
+
+            # The preceding op should only be connected to the split op
+            self.assertEqual([preceding_op.output],
+                             [product for product in products.values() if product.producer is preceding_op])
+            self.assertEqual(1, len(preceding_op.output.consumers))
+            split_op = preceding_op.output.consumers[0]
+            self.assertEqual(CG_SPLIT, split_op.type)
+            self.assertEqual([preceding_op.output], split_op.inputs)
+
+            # The split op should feed all the ops that used the output of the preceding op
+            split_product = split_op.output
+            self.assertIs(split_op, split_product.producer)
+            self.assertIs(split_product, products[split_product.name])
+            self.assertEqual(consumer_modules, {op.get_module() for op in split_product.consumers})
+            for consumer in split_product.consumers:
+                self.assertIn(split_product, consumer.inputs)
+
+    def test_split_detection_with_reused_module(self):
+        """ Test that op names sharing a prefix don't make a reused module look like a split """
+        class ModelWithReusedRelu(nn.Module):
+            def __init__(self):
+                super(ModelWithReusedRelu, self).__init__()
+                self.fc0 = nn.Linear(4, 4)
+                self.relu = nn.ReLU()
+                self.fcs = nn.ModuleList([nn.Linear(4, 4) for _ in range(11)])
+
+            def forward(self, *inputs):
+                x = self.relu(self.fc0(inputs[0]))
+                for fc in self.fcs[:-1]:
+                    x = fc(x)
+                return self.fcs[-1](self.relu(x))
+
+        model = ModelWithReusedRelu().eval()
+        inp_tensor_list = create_rand_tensors_given_shapes((1, 4), get_device(model))
+        conn_graph = ConnectedGraph(model, inp_tensor_list)
+
+        # Both uses of the reused Relu share a dotted name, and the name of the first is a prefix of the second
+        relu_ops = [op for op in conn_graph.get_all_ops().values() if op.get_module() is model.relu]
+        self.assertEqual(['Relu_1', 'Relu_12'], sorted(op.name for op in relu_ops))
+        self.assertEqual(relu_ops[0].dotted_name, relu_ops[1].dotted_name)
+
+        # Each Relu output is used by a single op, so no split should be inserted
+        self.assertEqual(0, conn_graph._split_count)
+        self.assertEqual(14, len(conn_graph.get_all_ops()))
+        for relu_op in relu_ops:
+            self.assertEqual(1, len(relu_op.output.consumers))
+            self.assertIs(relu_op, relu_op.output.producer)
+            self.assertIn(relu_op.output, relu_op.output.consumers[0].inputs)
+
+    def test_resnet18_op_and_product_names(self):
+        """ Test that the op, product and consumer names built for resnet18 stay the same """
+        model = models.resnet18().eval()
+        inp_tensor_list = create_rand_tensors_given_shapes((1, 3, 224, 224), get_device(model))
+        conn_graph = ConnectedGraph(model, inp_tensor_list)
+
+        # (op name, op dotted name, output product name, output product consumer names)
+        expected_ops = [
+            ('Conv_0', 'ResNet.conv1', 'Conv_0_to_BatchNormalization_1', ['BatchNormalization_1']),
+            ('BatchNormalization_1', 'ResNet.bn1', 'BatchNormalization_1_to_Relu_2', ['Relu_2']),
+            ('Relu_2', 'ResNet.relu', 'Relu_2_to_MaxPool_3', ['MaxPool_3']),
+            ('MaxPool_3', 'ResNet.maxpool', 'MaxPool_3__to__CG_Split_0', ['CG_Split_0']),
+            ('Conv_4', 'ResNet.layer1.0.conv1', 'Conv_4_to_BatchNormalization_5', ['BatchNormalization_5']),
+            ('BatchNormalization_5', 'ResNet.layer1.0.bn1', 'BatchNormalization_5_to_Relu_6', ['Relu_6']),
+            ('Relu_6', 'ResNet.layer1.0.relu', 'Relu_6_to_Conv_7', ['Conv_7']),
+            ('Conv_7', 'ResNet.layer1.0.conv2', 'Conv_7_to_BatchNormalization_8', ['BatchNormalization_8']),
+            ('BatchNormalization_8', 'ResNet.layer1.0.bn2', 'BatchNormalization_8_to_Add_10', ['Add_10']),
+            ('Add_10', 'Add_10', 'Add_10_to_Relu_11', ['Relu_11']),
+            ('Relu_11', 'ResNet.layer1.0.relu', 'Relu_11__to__CG_Split_1', ['CG_Split_1']),
+            ('Conv_12', 'ResNet.layer1.1.conv1', 'Conv_12_to_BatchNormalization_13', ['BatchNormalization_13']),
+            ('BatchNormalization_13', 'ResNet.layer1.1.bn1', 'BatchNormalization_13_to_Relu_14', ['Relu_14']),
+            ('Relu_14', 'ResNet.layer1.1.relu', 'Relu_14_to_Conv_15', ['Conv_15']),
+            ('Conv_15', 'ResNet.layer1.1.conv2', 'Conv_15_to_BatchNormalization_16', ['BatchNormalization_16']),
+            ('BatchNormalization_16', 'ResNet.layer1.1.bn2', 'BatchNormalization_16_to_Add_18', ['Add_18']),
+            ('Add_18', 'Add_18', 'Add_18_to_Relu_19', ['Relu_19']),
+            ('Relu_19', 'ResNet.layer1.1.relu', 'Relu_19__to__CG_Split_2', ['CG_Split_2']),
+            ('Conv_20', 'ResNet.layer2.0.conv1', 'Conv_20_to_BatchNormalization_21', ['BatchNormalization_21']),
+            ('BatchNormalization_21', 'ResNet.layer2.0.bn1', 'BatchNormalization_21_to_Relu_22', ['Relu_22']),
+            ('Relu_22', 'ResNet.layer2.0.relu', 'Relu_22_to_Conv_23', ['Conv_23']),
+            ('Conv_23', 'ResNet.layer2.0.conv2', 'Conv_23_to_BatchNormalization_24', ['BatchNormalization_24']),
+            ('BatchNormalization_24', 'ResNet.layer2.0.bn2', 'BatchNormalization_24_to_Add_28', ['Add_28']),
+            ('Conv_25', 'ResNet.layer2.0.downsample.0', 'Conv_25_to_BatchNormalization_26', ['BatchNormalization_26']),
+            ('BatchNormalization_26', 'ResNet.layer2.0.downsample.1', 'BatchNormalization_26_to_Add_28', ['Add_28']),
+            ('Add_28', 'Add_28', 'Add_28_to_Relu_29', ['Relu_29']),
+            ('Relu_29', 'ResNet.layer2.0.relu', 'Relu_29__to__CG_Split_3', ['CG_Split_3']),
+            ('Conv_30', 'ResNet.layer2.1.conv1', 'Conv_30_to_BatchNormalization_31', ['BatchNormalization_31']),
+            ('BatchNormalization_31', 'ResNet.layer2.1.bn1', 'BatchNormalization_31_to_Relu_32', ['Relu_32']),
+            ('Relu_32', 'ResNet.layer2.1.relu', 'Relu_32_to_Conv_33', ['Conv_33']),
+            ('Conv_33', 'ResNet.layer2.1.conv2', 'Conv_33_to_BatchNormalization_34', ['BatchNormalization_34']),
+            ('BatchNormalization_34', 'ResNet.layer2.1.bn2', 'BatchNormalization_34_to_Add_36', ['Add_36']),
+            ('Add_36', 'Add_36', 'Add_36_to_Relu_37', ['Relu_37']),
+            ('Relu_37', 'ResNet.layer2.1.relu', 'Relu_37__to__CG_Split_4', ['CG_Split_4']),
+            ('Conv_38', 'ResNet.layer3.0.conv1', 'Conv_38_to_BatchNormalization_39', ['BatchNormalization_39']),
+            ('BatchNormalization_39', 'ResNet.layer3.0.bn1', 'BatchNormalization_39_to_Relu_40', ['Relu_40']),
+            ('Relu_40', 'ResNet.layer3.0.relu', 'Relu_40_to_Conv_41', ['Conv_41']),
+            ('Conv_41', 'ResNet.layer3.0.conv2', 'Conv_41_to_BatchNormalization_42', ['BatchNormalization_42']),
+            ('BatchNormalization_42', 'ResNet.layer3.0.bn2', 'BatchNormalization_42_to_Add_46', ['Add_46']),
+            ('Conv_43', 'ResNet.layer3.0.downsample.0', 'Conv_43_to_BatchNormalization_44', ['BatchNormalization_44']),
+            ('BatchNormalization_44', 'ResNet.layer3.0.downsample.1', 'BatchNormalization_44_to_Add_46', ['Add_46']),
+            ('Add_46', 'Add_46', 'Add_46_to_Relu_47', ['Relu_47']),
+            ('Relu_47', 'ResNet.layer3.0.relu', 'Relu_47__to__CG_Split_5', ['CG_Split_5']),
+            ('Conv_48', 'ResNet.layer3.1.conv1', 'Conv_48_to_BatchNormalization_49', ['BatchNormalization_49']),
+            ('BatchNormalization_49', 'ResNet.layer3.1.bn1', 'BatchNormalization_49_to_Relu_50', ['Relu_50']),
+            ('Relu_50', 'ResNet.layer3.1.relu', 'Relu_50_to_Conv_51', ['Conv_51']),
+            ('Conv_51', 'ResNet.layer3.1.conv2', 'Conv_51_to_BatchNormalization_52', ['BatchNormalization_52']),
+            ('BatchNormalization_52', 'ResNet.layer3.1.bn2', 'BatchNormalization_52_to_Add_54', ['Add_54']),
+            ('Add_54', 'Add_54', 'Add_54_to_Relu_55', ['Relu_55']),
+            ('Relu_55', 'ResNet.layer3.1.relu', 'Relu_55__to__CG_Split_6', ['CG_Split_6']),
+            ('Conv_56', 'ResNet.layer4.0.conv1', 'Conv_56_to_BatchNormalization_57', ['BatchNormalization_57']),
+            ('BatchNormalization_57', 'ResNet.layer4.0.bn1', 'BatchNormalization_57_to_Relu_58', ['Relu_58']),
+            ('Relu_58', 'ResNet.layer4.0.relu', 'Relu_58_to_Conv_59', ['Conv_59']),
+            ('Conv_59', 'ResNet.layer4.0.conv2', 'Conv_59_to_BatchNormalization_60', ['BatchNormalization_60']),
+            ('BatchNormalization_60', 'ResNet.layer4.0.bn2', 'BatchNormalization_60_to_Add_64', ['Add_64']),
+            ('Conv_61', 'ResNet.layer4.0.downsample.0', 'Conv_61_to_BatchNormalization_62', ['BatchNormalization_62']),
+            ('BatchNormalization_62', 'ResNet.layer4.0.downsample.1', 'BatchNormalization_62_to_Add_64', ['Add_64']),
+            ('Add_64', 'Add_64', 'Add_64_to_Relu_65', ['Relu_65']),
+            ('Relu_65', 'ResNet.layer4.0.relu', 'Relu_65__to__CG_Split_7', ['CG_Split_7']),
+            ('Conv_66', 'ResNet.layer4.1.conv1', 'Conv_66_to_BatchNormalization_67', ['BatchNormalization_67']),
+            ('BatchNormalization_67', 'ResNet.layer4.1.bn1', 'BatchNormalization_67_to_Relu_68', ['Relu_68']),
+            ('Relu_68', 'ResNet.layer4.1.relu', 'Relu_68_to_Conv_69', ['Conv_69']),
+            ('Conv_69', 'ResNet.layer4.1.conv2', 'Conv_69_to_BatchNormalization_70', ['BatchNormalization_70']),
+            ('BatchNormalization_70', 'ResNet.layer4.1.bn2', 'BatchNormalization_70_to_Add_72', ['Add_72']),
+            ('Add_72', 'Add_72', 'Add_72_to_Relu_73', ['Relu_73']),
+            ('Relu_73', 'ResNet.layer4.1.relu', 'Relu_73_to_GlobalAveragePool_74', ['GlobalAveragePool_74']),
+            ('GlobalAveragePool_74', 'ResNet.avgpool', 'GlobalAveragePool_74_to_flatten_77', ['flatten_77']),
+            ('flatten_77', 'flatten_77', 'flatten_77_to_Gemm_78', ['Gemm_78']),
+            ('Gemm_78', 'ResNet.fc', None, []),
+            ('CG_Split_0', 'ResNet.CG_Split_0', 'CG_Split_0__to__multiple_ops', ['Conv_4', 'Add_10']),
+            ('CG_Split_1', 'ResNet.CG_Split_1', 'CG_Split_1__to__multiple_ops', ['Conv_12', 'Add_18']),
+            ('CG_Split_2', 'ResNet.CG_Split_2', 'CG_Split_2__to__multiple_ops', ['Conv_20', 'Conv_25']),
+            ('CG_Split_3', 'ResNet.CG_Split_3', 'CG_Split_3__to__multiple_ops', ['Conv_30', 'Add_36']),
+            ('CG_Split_4', 'ResNet.CG_Split_4', 'CG_Split_4__to__multiple_ops', ['Conv_38', 'Conv_43']),
+            ('CG_Split_5', 'ResNet.CG_Split_5', 'CG_Split_5__to__multiple_ops', ['Conv_48', 'Add_54']),
+            ('CG_Split_6', 'ResNet.CG_Split_6', 'CG_Split_6__to__multiple_ops', ['Conv_56', 'Conv_61']),
+            ('CG_Split_7', 'ResNet.CG_Split_7', 'CG_Split_7__to__multiple_ops', ['Conv_66', 'Add_72']),
+        ]
+        ops = [(op.name, op.dotted_name, op.output.name if op.output else None,
+                [consumer.name for consumer in op.output.consumers] if op.output else [])
+               for op in conn_graph.get_all_ops().values()]
+        self.assertEqual(expected_ops, ops)
+
+        # Besides the op outputs, the products are the model input, the flatten constants and the parameters
+        expected_product_names = {output_product_name for _, _, output_product_name, _ in expected_ops
+                                  if output_product_name is not None}
+        expected_product_names |= {'input_0_to_Conv_0', 'constant_8_to_flatten_77', 'constant_9_to_flatten_77'}
+        expected_product_names |= {'ResNet.' + name for name in model.state_dict()
+                                   if not name.endswith('num_batches_tracked')}
+        self.assertEqual(expected_product_names, set(conn_graph.get_all_products()))
+
 
 class ModelWithMultipleActivations(nn.Module):
     def __init__(self):
@@ -40,7 +40,7 @@ import pytest
 import torch
 
 from aimet_torch.gptvq.gptvq_optimizer import GPTVQOptimizer
-from aimet_torch.gptvq.utils import manipulate_inverse_hessian_diagonal
+from aimet_torch.gptvq.utils import manipulate_inverse_hessian_diagonal, get_assignments, do_kmeans_maximization
 
 
 class TestGPTVQOptimizer:
@@ -100,7 +100,59 @@ class TestGPTVQOptimizer:
         elif ndim == 3:
             assert manipulated_tensor.shape == (1, num_elements, 1, vector_dim)
         else:
-            assert torch.equal(
-                manipulated_tensor, torch.ones(tensor.shape[-1], device=tensor.device)
-            )
+            assert manipulated_tensor is None
 
+    @pytest.mark.parametrize("ndim", [None, 2, 3])
+    @pytest.mark.parametrize("chunk_size", [None, 7])
+    @pytest.mark.parametrize("centroid_chunk_size", [None, 5])
+    def test_get_assignments(self, ndim, chunk_size, centroid_chunk_size):
+        torch.manual_seed(0)
+        num_blocks_per_column, num_elements, vector_dim, num_of_centroids = 4, 32, 2, 16
+
+        tensor = torch.randn(num_blocks_per_column, num_elements, vector_dim)
+        centroids = torch.randn(num_blocks_per_column, num_of_centroids, vector_dim)
+        if ndim == 2:
+            hessian_inverse_diagonal = torch.rand(1, vector_dim) + 0.5
+        elif ndim == 3:
+            hessian_inverse_diagonal = torch.rand(1, num_elements, vector_dim) + 0.5
+        else:
+            hessian_inverse_diagonal = None
+
+        assignments = get_assignments(tensor, centroids, hessian_inverse_diagonal, chunk_size, centroid_chunk_size)
+
+        # Compare with brute-force distance computation
+        hessian = manipulate_inverse_hessian_diagonal(tensor, hessian_inverse_diagonal)
+        distance = (tensor.unsqueeze(2) - centroids.unsqueeze(1)).pow(2)
+        if hessian is not None:
+            distance = distance * hessian
+        distance = distance.sum(-1)
+        expected_distance = distance.min(-1).values
+        actual_distance = distance.gather(-1, assignments.unsqueeze(-1)).squeeze(-1)
+
+        assert assignments.shape == (num_blocks_per_column, num_elements)
+        assert torch.allclose(actual_distance, expected_distance, atol=1e-5)
+
+    @pytest.mark.parametrize("use_hessian", [False, True])
+    def test_do_kmeans_maximization(self, use_hessian):
+        torch.manual_seed(0)
+        num_blocks_per_column, num_elements, vector_dim, num_of_centroids = 4, 32, 2, 16
+
+        tensor = torch.randn(num_blocks_per_column, num_elements, vector_dim)
+        centroids = torch.randn(num_blocks_per_column, num_of_centroids, vector_dim)
+        # Leave the last centroid empty
+        assignments = torch.randint(num_of_centroids - 1, (num_blocks_per_column, num_elements))
+        hessian_inverse_diagonal = torch.rand(1, num_elements, vector_dim) + 0.5 if use_hessian else None
+
+        new_centroids = do_kmeans_maximization(tensor, centroids, assignments, hessian_inverse_diagonal)
+
+        # Compare with weighted mean of the vectors assigned to each centroid
+        weight = hessian_inverse_diagonal[0] if use_hessian else torch.ones(num_elements, vector_dim)
+        assert new_centroids.shape == centroids.shape
+        for g in range(num_blocks_per_column):
+            for k in range(num_of_centroids):
+                mask = assignments[g] == k
+                if not mask.any():
+                    assert torch.all(new_centroids[g, k] == 0)
+                    continue
+                expected = (tensor[g, mask] * weight[mask]).sum(0) / weight[mask].sum(0)
+                assert torch.allclose(new_centroids[g, k], expected, atol=1e-5)
@@ -35,7 +35,9 @@
 #  @@-COPYRIGHT-END-@@
 # =============================================================================
 
+import copy
 import functools
+import gc
 import itertools
 from packaging import version
 
@@ -65,10 +67,12 @@ from aimet_torch.v2.nn import (
     QuantizedGroupNorm,
 )
 from aimet_torch.v2.nn.fake_quant import _legacy_impl
-from aimet_torch.v2.nn.true_quant import _dispatch, _dispatch_table
+from aimet_torch.v2.nn.true_quant import _dispatch, _dispatch_table, _DispatchMixin, _DEQUANTIZED_PARAMETERS, \
+    _COMPILED_KERNELS
 from aimet_torch.v2.quantization.affine import AffineEncoding
+from aimet_torch.v2.quantization.encoding_analyzer import MinMaxEncodingAnalyzer, PercentileEncodingAnalyzer
 from aimet_torch.v2.quantization.tensor import QuantizedTensor, DequantizedTensor
-from aimet_torch.v2.utils import enable_recompute
+from aimet_torch.v2.utils import enable_recompute, patch_attr
 from aimet_torch.v2.nn import custom
 
 
@@ -247,6 +251,16 @@ def register_int_custom():
 
 
 
+def _generic_dispatch_forward(qmodule, *args, **kwargs):
+    """
+    Run forward pass through the generic _DispatchMixin path,
+    bypassing the module-specific specializations
+    """
+    generic_helper = functools.partial(_DispatchMixin._builtin_torch_fn_helper, qmodule)
+    with patch_attr(qmodule, '_builtin_torch_fn_helper', generic_helper):
+        return _DispatchMixin.forward(qmodule, *args, **kwargs)
+
+
 class TestTrueQuantLinear:
     @pytest.mark.usefixtures('register_int_linear')
     def test_no_quantizers(self, input):
@@ -416,6 +430,195 @@ class TestTrueQuantLinear:
         assert not torch.all(fp_linear.weight == quant_linear.weight)
 
 
+    @pytest.mark.parametrize('bias', [True, False])
+    @pytest.mark.parametrize('input_type', ['float', 'quantized', 'integer'])
+    def test_fallback_parity(self, input, bias, input_type):
+        """
+        Given: QuantizedLinear without custom kernel
+        """
+        qlinear = QuantizedLinear(10, 10, bias=bias)
+        qlinear.input_quantizers[0] = QuantizeDequantize((), 8, False)
+        qlinear.output_quantizers[0] = QuantizeDequantize((), 8, False)
+        qlinear.param_quantizers['weight'] = QuantizeDequantize((10, 1), 8, True)
+        ref_qlinear = copy.deepcopy(qlinear)
+
+        if input_type == 'quantized':
+            qtzr = Quantize((), 8, False)
+            with qtzr.compute_encodings():
+                input = qtzr(input)
+        elif input_type == 'integer':
+            input = (input * 100).long()
+
+            """
+            When: Run forward with integer input
+            Then: Both specialized and generic path should fail the same way as F.linear
+            """
+            with pytest.raises(RuntimeError):
+                F.linear(input, qlinear.weight)
+            with pytest.raises(RuntimeError):
+                with qlinear.compute_encodings():
+                    qlinear(input)
+            with pytest.raises(RuntimeError):
+                with ref_qlinear.compute_encodings():
+                    _generic_dispatch_forward(ref_qlinear, input)
+            return
+
+        """
+        When: Run forward within compute_encodings context
+        Then: The specialized path should produce the same output and encodings as the generic path
+        """
+        with qlinear.compute_encodings():
+            out = qlinear(input)
+        with ref_qlinear.compute_encodings():
+            ref_out = _generic_dispatch_forward(ref_qlinear, input)
+
+        assert type(out) is type(ref_out)
+        assert torch.equal(out, ref_out)
+
+        params = dict(qlinear.named_parameters())
+        ref_params = dict(ref_qlinear.named_parameters())
+        assert params.keys() == ref_params.keys()
+        for name, param in params.items():
+            assert torch.equal(param, ref_params[name])
+
+        """
+        When: Run forward outside of compute_encodings context
+        Then: The specialized path should produce the same output as the generic path
+        """
+        out = qlinear(input)
+        ref_out = _generic_dispatch_forward(ref_qlinear, input)
+        assert type(out) is type(ref_out)
+        assert torch.equal(out, ref_out)
+
+    @pytest.mark.parametrize('bias', [True, False])
+    @pytest.mark.parametrize('input_type', ['float', 'quantized', 'integer'])
+    def test_custom_kernel_parity(self, input, bias, input_type):
+        """
+        Given: QuantizedLinear with custom kernel
+        """
+        kernel_args = []
+
+        def int_linear(input, weight, bias=None, *, output_encodings=None):
+            kernel_args.append((input, weight, bias))
+            if isinstance(input, QuantizedTensor):
+                input = input.dequantize()
+            output = F.linear(input.float(), weight.dequantize(), bias)
+            return affine_quantize(output,
+                                   output_encodings.scale,
+                                   output_encodings.offset,
+                                   output_encodings.bitwidth)
+
+        qlinear = QuantizedLinear(10, 10, bias=bias)
+        qlinear.input_quantizers[0] = Quantize((), 8, False)
+        qlinear.output_quantizers[0] = Quantize((), 8, False)
+        qlinear.param_quantizers['weight'] = Quantize((10, 1), 8, True)
+        with qlinear.compute_encodings():
+            qlinear(input)
+        qlinear.set_kernel(int_linear)
+
+        if input_type == 'quantized':
+            input = qlinear.input_quantizers[0](input)
+        elif input_type == 'integer':
+            input = (input * 100).long()
+
+        """
+        When: Run forward with custom kernel
+        Then: The kernel should be called with the same arguments and
+              produce the same output as the generic path
+        """
+        out = qlinear(input)
+        ref_out = _generic_dispatch_forward(qlinear, input)
+        assert type(out) is type(ref_out)
+        assert torch.equal(out, ref_out)
+
+        (kernel_input, kernel_weight, kernel_bias), (ref_input, ref_weight, ref_bias) = kernel_args
+        assert type(kernel_input) is type(ref_input)
+        assert torch.equal(kernel_input, ref_input)
+        assert torch.equal(kernel_weight, ref_weight)
+        if bias:
+            assert torch.equal(kernel_bias, ref_bias)
+        else:
+            assert kernel_bias is None and ref_bias is None
+
+        if input_type == 'integer':
+            # Integer inputs should be passed to the kernel as-is
+            assert kernel_input is input
+
+
+    @pytest.mark.skipif(version.parse(torch.__version__) < version.parse("2.0.0"),
+                        reason="torch.compile requires torch>=2.0.0")
+    def test_use_torch_compile(self, input, monkeypatch):
+        """
+        Given: QuantizedLinear with custom kernel
+        """
+        def int_linear(input, weight, bias=None, *, output_encodings=None):
+            output = F.linear(input.dequantize(), weight.dequantize(), bias)
+            return affine_quantize(output,
+                                   output_encodings.scale,
+                                   output_encodings.offset,
+                                   output_encodings.bitwidth)
+
+        qlinear = QuantizedLinear(10, 10)
+        qlinear.input_quantizers[0] = Quantize((), 8, False)
+        qlinear.output_quantizers[0] = Quantize((), 8, False)
+        qlinear.param_quantizers['weight'] = Quantize((10, 1), 8, True)
+        with qlinear.compute_encodings():
+            qlinear(input)
+        qlinear.set_kernel(int_linear)
+        expected = qlinear(input)
+
+        compiled_kernels = []
+        compiled_kernel_calls = []
+        torch_compile = torch.compile
+
+        def compile_spy(fn, **kwargs):
+            compiled_kernels.append(fn)
+            compiled_kernel = torch_compile(fn, **kwargs, backend='eager')
+
+            def compiled_kernel_spy(*args, **kwargs):
+                compiled_kernel_calls.append(fn)
+                return compiled_kernel(*args, **kwargs)
+
+            return compiled_kernel_spy
+
+        monkeypatch.setattr(torch, 'compile', compile_spy)
+
+        """
+        When: Run forward repeatedly with use_torch_compile=True
+        Then: 1) The kernel should be compiled only once and the compiled kernel should be used
+              2) The output should be equal to that of the eager kernel
+        """
+        with patch_attr(QuantizationMixin, 'use_torch_compile', True):
+            out = qlinear(input)
+            assert torch.equal(out, expected)
+            out = qlinear(input)
+            assert torch.equal(out, expected)
+
+        assert compiled_kernels == [int_linear]
+        assert compiled_kernel_calls == [int_linear, int_linear]
+        kernel, _ = _COMPILED_KERNELS[qlinear]
+        assert kernel is int_linear
+
+        """
+        When: Change the kernel
+        Then: The new kernel should be compiled
+        """
+        new_kernel = functools.partial(int_linear)
+        qlinear.set_kernel(new_kernel)
+        with patch_attr(QuantizationMixin, 'use_torch_compile', True):
+            assert torch.equal(qlinear(input), expected)
+        assert compiled_kernels[-1] is new_kernel
+        assert compiled_kernel_calls[-1] is new_kernel
+
+        """
+        When: Delete the module
+        Then: The compiled kernel should be released
+        """
+        del qlinear
+        gc.collect()
+        assert not any(kernel is new_kernel for kernel, _ in _COMPILED_KERNELS.values())
+
+
 class TestQuantizedLayers:
     @pytest.mark.usefixtures('register_int_norm', 'register_int_custom', 'register_int_activation')
     @pytest.mark.parametrize(
@@ -635,6 +838,94 @@ class TestQuantizedLayers:
         qlinear._remove_output_quantizers(0)
         assert qlinear.output_quantizers[0] is None
 
+    def test_prequantized_weight(self, input):
+        qlinear = QuantizedLinear(10, 10, bias=False)
+        weight_qtzr = Quantize(shape=(), bitwidth=8, symmetric=True)
+        with weight_qtzr.compute_encodings():
+            qweight = weight_qtzr(qlinear.weight)
+        qlinear.weight = nn.Parameter(qweight)
+
+        """
+        When: Run forward with a weight that holds already-quantized values
+        Then: Output should be computed with the dequantized weight
+        """
+        expected_out = F.linear(input, qweight.dequantize())
+        with torch.no_grad():
+            assert torch.equal(qlinear(input), expected_out)
+
+        """
+        When: Run forward without enabling cache_dequantized_parameters
+        Then: The dequantized weight shouldn't be cached
+        """
+        assert qlinear not in _DEQUANTIZED_PARAMETERS
+
+        with patch_attr(QuantizationMixin, 'cache_dequantized_parameters', True):
+            """
+            When: Run forward repeatedly under no_grad with cache_dequantized_parameters enabled
+            Then: The dequantized weight should be reused as long as the weight is unchanged
+            """
+            with torch.no_grad():
+                assert torch.equal(qlinear(input), expected_out)
+            dequantized_weight = _DEQUANTIZED_PARAMETERS[qlinear]['weight'][-1]
+            with torch.no_grad():
+                assert torch.equal(qlinear(input), expected_out)
+            assert _DEQUANTIZED_PARAMETERS[qlinear]['weight'][-1] is dequantized_weight
+
+            """
+            When: Modify the scale of the weight encoding in place
+            Then: The dequantized weight should be recomputed
+            """
+            with torch.no_grad():
+                qlinear.weight.encoding.scale.mul_(2)
+                out = qlinear(input)
+            assert torch.equal(out, F.linear(input, qlinear.weight.dequantize()))
+            assert not torch.equal(out, expected_out)
+            assert _DEQUANTIZED_PARAMETERS[qlinear]['weight'][-1] is not dequantized_weight
+            dequantized_weight = _DEQUANTIZED_PARAMETERS[qlinear]['weight'][-1]
+
+            """
+            When: Replace the weight
+            Then: The dequantized weight should be recomputed
+            """
+            with weight_qtzr.compute_encodings():
+                qweight = weight_qtzr(torch.randn_like(qweight))
+            qlinear.weight = nn.Parameter(qweight)
+            with torch.no_grad():
+                assert torch.equal(qlinear(input), F.linear(input, qweight.dequantize()))
+            assert _DEQUANTIZED_PARAMETERS[qlinear]['weight'][-1] is not dequantized_weight
+
+
+def test_builtin_torch_fn_helper_quantizer_lookup(input):
+    """
+    Given: Fallback wrapper of a single-input quantized module
+    """
+    qsigmoid = QuantizedSigmoid()
+    qsigmoid.input_quantizers[0] = QuantizeDequantize((), 8, False)
+    qsigmoid.output_quantizers[0] = QuantizeDequantize((), 8, False)
+    qsigmoid.input_quantizers[0].set_range(-1, 1)
+    qsigmoid.output_quantizers[0].set_range(0, 1)
+    wrapper = qsigmoid._builtin_torch_fn_helper(torch.sigmoid)
+
+    """
+    When: Replace the quantizers after creating the wrapper
+    Then: The wrapper should use the new quantizers
+    """
+    qsigmoid.input_quantizers[0] = QuantizeDequantize((), 4, False)
+    qsigmoid.output_quantizers[0] = QuantizeDequantize((), 4, False)
+    qsigmoid.input_quantizers[0].set_range(-1, 1)
+    qsigmoid.output_quantizers[0].set_range(0, 1)
+
+    expected = qsigmoid.output_quantizers[0](torch.sigmoid(qsigmoid.input_quantizers[0](input)))
+    assert torch.equal(wrapper(input), expected)
+
+    """
+    When: Remove the quantizers after creating the wrapper
+    Then: The wrapper should skip quantization
+    """
+    qsigmoid.input_quantizers[0] = None
+    qsigmoid.output_quantizers[0] = None
+    assert torch.equal(wrapper(input), torch.sigmoid(input))
+
 
 def test_dispatch_sanity():
     custom_add = lambda *args, **kwargs: torch.add(*args, **kwargs) + 1
@@ -1001,3 +1292,39 @@ def test_default_kernels(module_factory, input_factory):
 
     for out_, tout_ in zip(tree_flatten(out)[0], tree_flatten(tout)[0]):
         assert torch.equal(out_, tout_)
+
+
+@pytest.mark.parametrize('encoding_analyzer_cls', [MinMaxEncodingAnalyzer, PercentileEncodingAnalyzer])
+def test_fake_quantized_split(encoding_analyzer_cls):
+    """
+    Given: Legacy fake-quantized split with a per-tensor output quantizer
+    """
+    qsplit = _create_legacy_fake_quantized_module(custom.Split())
+    qsplit.input_quantizers[0] = None
+    qsplit.output_quantizers[0].encoding_analyzer = encoding_analyzer_cls(())
+    ref_qtzr = QuantizeDequantize((), 8, False, encoding_analyzer=encoding_analyzer_cls(()))
+    x = randn(10, 10)
+    x[:3] *= 100
+
+    """
+    When: Compute encodings
+    Then: The output quantizer should observe each output separately
+    """
+    with qsplit.compute_encodings():
+        _ = qsplit(x, 3)
+
+    with ref_qtzr.compute_encodings():
+        _ = [ref_qtzr(chunk) for chunk in torch.split(x, 3)]
+
+    assert torch.equal(qsplit.output_quantizers[0].min, ref_qtzr.min)
+    assert torch.equal(qsplit.output_quantizers[0].max, ref_qtzr.max)
+
+    """
+    When: Run forward after computing encodings
+    Then: The outputs should be equal to quantizing each output separately
+    """
+    outputs = qsplit(x, 3)
+    expected = [ref_qtzr(chunk) for chunk in torch.split(x, 3)]
+    assert len(outputs) == len(expected)
+    for out, expected_out in zip(outputs, expected):
+        assert torch.equal(out, expected_out)
@@ -51,6 +51,7 @@ from aimet_torch.v2.quantization.affine import AffineQuantizerBase, Quantize, \
     QuantizeDequantize, GroupedBlockQuantizeDequantize
 from aimet_torch.v2.quantization import affine
 import aimet_torch.v2.quantization as Q
+from aimet_torch.v2.utils import patch_attr
 from ...test_deepspeed import CustomMPU
 
 
@@ -1548,3 +1549,146 @@ def test_parse_args_error():
     Then: Create quantizer normally
     """
     Quantize((1, 10), -128, 127, True)
+
+
+@pytest.fixture
+def enable_encoding_cache():
+    with patch_attr(affine.quantizer.MinMaxQuantizer, 'cache_encodings', True):
+        yield
+
+
+@pytest.mark.parametrize('qtzr_cls', [Quantize, QuantizeDequantize])
+def test_get_encoding_cache_disabled(qtzr_cls):
+    qtzr = qtzr_cls((10,), 8, False)
+    qtzr.set_range(-1, 1)
+
+    """
+    When: Call get_encoding() twice under torch.no_grad() without opting in to the cache
+    Then: Compute a new encoding every time
+    """
+    with torch.no_grad():
+        encoding = qtzr.get_encoding()
+        assert qtzr.get_encoding().scale is not encoding.scale
+    assert qtzr not in affine.quantizer._CACHED_ENCODINGS
+
+
+@pytest.mark.usefixtures('enable_encoding_cache')
+@pytest.mark.parametrize('qtzr_cls', [Quantize, QuantizeDequantize])
+def test_get_encoding_cache(qtzr_cls):
+    qtzr = qtzr_cls((10,), 8, False)
+    qtzr.set_range(-1, 1)
+    x = torch.randn(10)
+
+    """
+    When: Call get_encoding() twice under torch.no_grad()
+    Then: Return an encoding object sharing the same scale and offset
+    """
+    with torch.no_grad():
+        encoding = qtzr.get_encoding()
+        cached_encoding = qtzr.get_encoding()
+        assert cached_encoding.scale is encoding.scale
+        assert cached_encoding.offset is encoding.offset
+
+    """
+    When: Modify the first or any later returned encoding object
+    Then: The cached encoding shouldn't be affected
+    """
+    with torch.no_grad():
+        expected_out = qtzr(x)
+        expected_out.encoding.bitwidth = 4
+        out = qtzr(x)
+    assert out.encoding.bitwidth == 8
+    assert torch.equal(out, expected_out)
+
+    encoding.bitwidth = 4
+    cached_encoding.bitwidth = 4
+    with torch.no_grad():
+        assert qtzr.get_encoding().bitwidth == 8
+
+    """
+    When: Call get_encoding() with autograd enabled
+    Then: Return a new encoding object which is part of the autograd graph
+    """
+    assert qtzr.get_encoding().scale is not encoding.scale
+    assert qtzr.get_encoding().scale.requires_grad
+
+    """
+    When: Update min/max, quantization grid, or the min parameter object and call get_encoding() again
+    Then: Return a new encoding object reflecting the change
+    """
+    qtzr.set_range(-2, 2)
+    with torch.no_grad():
+        new_encoding = qtzr.get_encoding()
+    assert torch.allclose(new_encoding.scale, encoding.scale * 2)
+
+    qtzr.bitwidth = 4
+    with torch.no_grad():
+        new_encoding = qtzr.get_encoding()
+    assert new_encoding.bitwidth == 4
+
+    encoding = new_encoding
+    qtzr.min = nn.Parameter(-torch.ones(10) * 3)
+    with torch.no_grad():
+        new_encoding = qtzr.get_encoding()
+    assert new_encoding.scale is not encoding.scale
+    assert torch.allclose(new_encoding.min, qtzr.get_min())
+
+    """
+    When: Reassign the data of min/max (e.g. deepspeed zero3 partitioning) and call get_encoding() again
+    Then: Return a new encoding object reflecting the change
+    """
+    encoding = new_encoding
+    qtzr.max.data = torch.ones(10) * 4
+    with torch.no_grad():
+        new_encoding = qtzr.get_encoding()
+    assert new_encoding.scale is not encoding.scale
+    assert torch.allclose(new_encoding.max, qtzr.get_max())
+
+    """
+    When: Convert the quantizer to a different dtype and call get_encoding() again
+    Then: Return a new encoding object computed from the converted parameters
+    """
+    encoding = new_encoding
+    qtzr.double()
+    with torch.no_grad():
+        new_encoding = qtzr.get_encoding()
+    assert new_encoding.scale is not encoding.scale
+
+
+@pytest.mark.usefixtures('enable_encoding_cache')
+@pytest.mark.parametrize('qtzr_cls', [Quantize, QuantizeDequantize])
+def test_get_encoding_cache_bypass(qtzr_cls):
+    qtzr = qtzr_cls((10,), 8, False)
+    qtzr.set_range(-1, 1)
+
+    with torch.no_grad():
+        encoding = qtzr.get_encoding()
+
+    """
+    When: Call get_encoding() while tracing
+    Then: Don't return the cached encoding
+    """
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.qtzr = qtzr
+
+        def forward(self, x):
+            assert self.qtzr.get_encoding().scale is not encoding.scale
+            return self.qtzr(x)
+
+    with torch.no_grad():
+        torch.jit.trace(Model(), torch.randn(10), check_trace=False)
+
+    """
+    When: Call get_encoding() while computing encodings
+    Then: Don't cache the encoding derived from the batch statistics
+    """
+    with torch.no_grad(), qtzr.compute_encodings():
+        qtzr(torch.randn(10) * 10)
+        assert qtzr not in affine.quantizer._CACHED_ENCODINGS
+
+    with torch.no_grad():
+        new_encoding = qtzr.get_encoding()
+    assert torch.allclose(new_encoding.min, qtzr.get_min())
+    assert torch.allclose(new_encoding.max, qtzr.get_max())